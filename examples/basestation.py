@@ -3,6 +3,7 @@
 from email.mime.text import MIMEText
 from os.path import dirname
 from pygame import mixer
+from signal import pause
 from simplisafe import DeviceType
 from simplisafe.devices import BaseStation
 from simplisafe.messages import Message
@@ -27,20 +28,28 @@ components = [
 
 class MyBaseStation(BaseStation):
 
+    def __init__(self, *args, **kwargs):
+        mixer.init() # Opened once, before the receive thread can call door_chime
+        self._sounds = {}
+        super().__init__(*args, **kwargs)
+
     def _process_msg(self, msg: Message):
-        print(msg.__class__.__name__ + " received from '" + self._components.get(msg.sn).get('name') + "' with serial number '" + msg.sn + "' and sequence '" + str(msg.sequence) + "'")
+        c = self._components.get(msg.sn)
+        name = c['name'] if c else "unenrolled component" # Let BaseStation ignore it rather than killing the receive thread
+        print(f"{type(msg).__name__} received from '{name}' with serial number '{msg.sn}' and sequence '{msg.sequence}'")
         super()._process_msg(msg)
 
     def _send(self, msg: Message):
-        print(msg.__class__.__name__ + " sent")
+        print(f"{type(msg).__name__} sent")
 
     def alarm(self):
         msg = MIMEText('') # TODO
         msg['Subject'] = 'SimpliSafe Alarm!'
         self.send_email(msg)
 
-    def alert(self):
-        msg = MIMEText('') # TODO
+    def alert(self, alert_type: str, sn: str):
+        c = self._components.get(sn, {})
+        msg = MIMEText(f"{alert_type}: '{c.get('name', '')}' with serial number '{sn}'")
         msg['Subject'] = 'SimpliSafe Alert!'
         self.send_email(msg)
 
@@ -60,10 +69,9 @@ class MyBaseStation(BaseStation):
         self.send_email(msg)
 
     def door_chime(self):
-        mixer.init()
-        mixer.music.load(dirname(__file__) + '/sounds/door_chime.mp3')
-        mixer.music.set_volume(self._settings.get('voice_volume', 100) / 100)
-        mixer.music.play()
+        chime = self.sound('door_chime')
+        chime.set_volume(self._settings.get('voice_volume', 100) / 100)
+        chime.play()
 
     def send_email(self, msg: MIMEText):
         msg['From'] = 'pi@localhost'
@@ -75,18 +83,20 @@ class MyBaseStation(BaseStation):
         except:
             print('E-mail send failed.')
 
+    def sound(self, name: str) -> mixer.Sound:
+        if name not in self._sounds: # Decoded on first use, then kept in memory
+            self._sounds[name] = mixer.Sound(dirname(__file__) + '/sounds/' + name + '.mp3')
+        return self._sounds[name]
+
     def start_siren(self):
-        mixer.init()
-        mixer.music.load(dirname(__file__) + '/sounds/siren.mp3')
-        mixer.music.set_volume(self._settings.get('siren_volume', 100) / 100)
-        mixer.music.play(-1)
+        siren = self.sound('siren')
+        siren.set_volume(self._settings.get('siren_volume', 100) / 100)
+        siren.play(-1)
 
     def stop_siren(self):
-        if mixer and mixer.get_init():
-            mixer.music.stop()
-            mixer.quit()
+        self.sound('siren').stop()
 
 with Transceiver(rx=RX_433MHZ_GPIO, tx=TX_315MHZ_GPIO) as txr:
     bs = MyBaseStation(txr, "123456", 8331, components=components)
     while True:
-        pass
+        pause() # Sleep instead of spinning; the transceiver and device threads do the work
@@ -2,6 +2,7 @@
 
 from os.path import dirname
 from pygame import mixer
+from signal import pause
 from simplisafe import DeviceType
 from simplisafe.devices import Keypad
 from simplisafe.messages import Message
@@ -13,12 +14,12 @@ TX_433MHZ_GPIO = 20 # Connected to DATA pin of 433MHz transmitter
 class MyKeypad(Keypad):
 
     def _process_msg(self, msg: Message):
-        print(msg.__class__.__name__ + " received from base station with serial number '" + msg.sn + "'")
+        print(f"{type(msg).__name__} received from base station with serial number '{msg.sn}'")
         super()._process_msg(msg)
 
     def _send(self, msg: Message):
         super()._send(msg)
-        print(msg.__class__.__name__ + " sent")
+        print(f"{type(msg).__name__} sent")
 
     def backlight(self, on: bool):
         if (on):
@@ -38,4 +39,4 @@ class MyKeypad(Keypad):
 with Transceiver(rx=RX_315MHZ_GPIO, tx=TX_433MHZ_GPIO) as txr:
     bs = MyKeypad(txr, "12345")
     while True:
-        pass
+        pause() # Sleep instead of spinning; the transceiver and device threads do the work
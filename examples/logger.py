@@ -1,27 +1,47 @@
 #!/usr/bin/python3
 import cymysql
 from select import select
+from time import monotonic
 from simplisafe.pigpio import Transceiver
 
 RX_315MHZ_GPIO = 27 # Connected to DATA pin of 315MHz receiver
 RX_433MHZ_GPIO = 17 # Connected to DATA pin of 433MHz receiver
+COMMIT_COUNT = 32 # Commit once this many messages are pending...
+COMMIT_DELAY = 5 # ...or once the oldest pending message is this many seconds old
+INSERT_SQL = "INSERT INTO `log` (`msg`) VALUES (%s)" # Use simplisafe.messages.Message.factory() to restore object
 
 cnx = cymysql.connect(user='pi', passwd='raspberry', unix_socket='/var/run/mysqld/mysqld.sock', port=3306, db='mydb')
 cursor = cnx.cursor()
+pending = []
+deadline = None
+
+def commit():
+    cursor.executemany(INSERT_SQL, pending)
+    cnx.commit()
+    pending.clear()
 
 with Transceiver(rx=RX_315MHZ_GPIO) as txr315, Transceiver(rx=RX_433MHZ_GPIO) as txr433:
-    while True:
-        rlist, _, _ = select([txr315, txr433], [], [])
-        for txr in rlist:
-            try:
-                msg = txr.recv() # simplisafe.message.Message object
-            except Exception as e:
-                print(str(e))
-                continue
-            msg_str = "".join(map("{:02X}".format, bytes(msg))) # Convert to hex string for storage
-            print(str(msg.__class__.__name__) + ": " + msg_str)
-            cursor.execute("INSERT INTO `log` (`msg`) VALUES (%s)", (msg_str,)) # Use simplisafe.messages.Message.factory() to restore object
-            cnx.commit()
+    try:
+        while True:
+            timeout = None if deadline is None else max(deadline - monotonic(), 0)
+            rlist, _, _ = select([txr315, txr433], [], [], timeout) # Wakes up to commit stragglers when idle
+            for txr in rlist:
+                try:
+                    msg = txr.recv() # simplisafe.message.Message object
+                except Exception as e:
+                    print(str(e))
+                    continue
+                msg_str = bytes(msg).hex().upper() # Convert to hex string for storage
+                print(f"{type(msg).__name__}: {msg_str}")
+                pending.append((msg_str,))
+                if deadline is None:
+                    deadline = monotonic() + COMMIT_DELAY
+            if pending and (len(pending) >= COMMIT_COUNT or monotonic() >= deadline):
+                commit()
+                deadline = None
+    finally:
+        if pending:
+            commit()
 
 cursor.close()
 cnx.close()
@@ -5,11 +5,17 @@ class UniqueEnum(Enum):
 
     @classmethod
     def key(cls, value):
+        if '_keys' not in cls.__dict__: # Reverse lookup, built on first use; first name wins for aliases
+            cls._keys = {member: name for name, member in reversed(cls.__members__.items())}
         try:
-          return list(cls.__members__.keys())[list(cls.__members__.values()).index(value)]
-        except ValueError:
+          return cls._keys[value]
+        except KeyError:
           return "Value does not exist in " + str(cls) + ": 0x{:02X}".format(value)
 
+    @classmethod
+    def lookup(cls, value):
+        return cls._value2member_map_.get(value) # Member with value, or None; cheaper than cls(value) and its ValueError
+
 
 class UniqueIntEnum(IntEnum, UniqueEnum):
     pass
@@ -44,9 +50,7 @@ class Validator:
     @staticmethod
     def pin(pin):
         pin = str(pin)
-        try:
-            int(pin)
-        except ValueError:
+        if not (pin.isascii() and pin.isdecimal()): # ASCII digits only, as _PIN_BYTES has no entries for other Unicode digits
             raise ValueError("PIN must be numeric")
         if len(pin) != 4:
             raise ValueError("PIN must be 4 digits")
@@ -57,9 +61,7 @@ class Validator:
         if prefix is None:
             return None
         prefix = str(prefix)
-        try:
-            int(prefix)
-        except ValueError:
+        if not (prefix.isascii() and prefix.isdecimal()):
             raise Exception("Prefix must be numeric")
         if len(prefix) != 1:
             raise Exception("Prefix must be 1 digit")
@@ -1,8 +1,60 @@
 #!/usr/bin/python3
 from simplisafe import *
 from simplisafe.messages import *
-from threading import Thread, Timer
-from time import time
+import sched
+from sys import stderr
+from threading import Event, Lock, Thread, Timer
+from time import monotonic, time
+from traceback import print_exc
+
+class Scheduler: # Runs delayed calls on one shared daemon thread, instead of a Timer thread per call
+    # Calls run one at a time, so a call that blocks (e.g. a hook sending e-mail, or a transmission) delays every device's timers
+
+    def __init__(self):
+        self._wake = Event()
+        self._sched = sched.scheduler(monotonic, self._sleep)
+        self._thread = None
+        self._lock = Lock()
+
+    def _run(self):
+        while True:
+            try:
+                self._sched.run()
+            except Exception:
+                print_exc() # Keep serving the other calls
+                continue
+            self._wake.wait() # Queue empty
+            self._wake.clear()
+
+    def _sleep(self, timeout: float):
+        self._wake.wait(timeout) # Cut short by enterabs(), in case the new call is due sooner
+        self._wake.clear()
+
+    def cancel(self, event):
+        if event is None:
+            return
+        try:
+            self._sched.cancel(event)
+        except ValueError:
+            pass # Already run
+
+    def enter(self, delay: float, function, *args):
+        return self.enterabs(monotonic() + delay, function, *args)
+
+    def enterabs(self, t: float, function, *args): # t is on the monotonic() clock
+        event = self._sched.enterabs(t, 0, function, args)
+        if self._thread is None:
+            self._start()
+        self._wake.set()
+        return event
+
+    def _start(self): # On first use, so importing this module does not start a thread
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+SCHEDULER = Scheduler()
 
 # Level 1
 class AbstractTransceiver:
@@ -13,30 +65,58 @@ class AbstractTransceiver:
     def recv(self):
         raise NotImplementedError
 
+    def recv_batch(self, max_msgs: int=16) -> list: # Blocks for one message, plus any already waiting
+        return [self.recv()]
+
     def send(self, msg: Message):
         raise NotImplementedError
 
 
 class AbstractDevice:
 
+    receiver = True # Whether to start a thread feeding txr.recv() to _process_msg
     sequence = 0
 
     def __init__(self, txr: AbstractTransceiver, sn: str):
         self.txr = txr
         self.sn = sn
-        Thread(target=self._recv, daemon=True).start()
+        if self.receiver:
+            Thread(target=self._recv, daemon=True).start()
 
     def _inc(self):
         self.sequence += 1
         self.sequence %= 0xF
 
     def _recv(self):
+        recv_batch = self.txr.recv_batch
+        process_msg = self._process_msg
         while True:
-            self._process_msg(self.txr.recv())
+            try:
+                msgs = recv_batch()
+            except ValueError as e: # Undecodable frame; keep listening
+                print(str(e), file=stderr)
+                continue
+            for msg in msgs:
+                try:
+                    process_msg(msg)
+                except ValueError as e:
+                    print(str(e), file=stderr)
+                except Exception:
+                    print_exc() # Keep serving the other messages
 
     def _process_msg(self, msg: Message):
         raise NotImplementedError
 
+    @staticmethod
+    def _repeat(interval: float, function) -> Event: # Calls function every interval until it returns False, raises, or the Event is set
+        stop = Event()
+        def run(deadline):
+            if not stop.is_set() and function():
+                SCHEDULER.enterabs(deadline + interval, run, deadline + interval) # From the last deadline, so late calls do not accumulate drift
+        deadline = monotonic() + interval
+        SCHEDULER.enterabs(deadline, run, deadline)
+        return stop
+
     def _send(self, msg: Message):
         self.txr.send(msg)
         self._inc()
@@ -108,6 +188,89 @@ class BaseStation(AbstractDevice):
     class FreezeSensorSetting(UniqueIntEnum):
         DISABLED = 0
 
+    HEARTBEAT_TIMEOUT = 24 * 3600 # Seconds without a message before a component is reported not responding
+
+    HANDLERS = { # _process_msg handler names by message class; other classes use their nearest base listed here
+        Message: '_process_unhandled_msg',
+        KeypadMessage: '_process_ignored_msg',
+        KeypadRemoveComponentScrollMenuRequest: '_process_remove_component_menu_request',
+        KeypadRemoveComponentMenuRequest: '_process_remove_component_menu_request',
+        KeypadAlarmPinRequest: '_process_alarm_pin_request',
+        KeypadMenuPinRequest: '_process_menu_pin_request',
+        KeypadNewPinRequest: '_process_new_pin_request',
+        KeypadExtendedStatusRequest: '_process_extended_status_request',
+        KeypadTestModeOnRequest: '_process_test_mode_on_request',
+        KeypadTestModeOffRequest: '_process_test_mode_off_request',
+        KeypadHomeRequest: '_process_home_request',
+        KeypadPanicRequest: '_process_panic_request',
+        KeypadAwayRequest: '_process_away_request',
+        KeypadOffRequest: '_process_off_request',
+        KeypadEnterMenuRequest: '_process_menu_request',
+        KeypadExitMenuRequest: '_process_menu_request',
+        KeypadChangePinMenuRequest: '_process_menu_request',
+        KeypadChangePinConfirmMenuRequest: '_process_menu_request',
+        KeypadAddComponentMenuRequest: '_process_menu_request',
+        KeypadRemoveComponentSelectMenuRequest: '_process_menu_request',
+        KeypadAddComponentTypeMenuRequest: '_process_menu_request',
+        KeypadAddComponentLastTypeMenuRequest: '_process_ignored_msg', # TODO
+        KeypadPrefixRequest: '_process_prefix_request',
+        KeypadRemoveComponentConfirmMenuRequest: '_process_remove_component_confirm_menu_request',
+        KeypadModifyComponentMenuRequest: '_process_add_component_menu_request',
+        KeychainRemoteMessage: '_process_keychain_remote_msg',
+        PanicButtonMessage: '_process_panic_button_msg',
+        MotionSensorMessage: '_process_motion_sensor_msg',
+        EntrySensorMessage: '_process_entry_sensor_msg',
+        GlassbreakSensorMessage: '_process_glassbreak_sensor_msg'
+    }
+
+    MENU_RESPONSES = { # Response classes of menu requests that only need acknowledging
+        KeypadEnterMenuRequest: BaseStationKeypadEnterMenuResponse,
+        KeypadExitMenuRequest: BaseStationKeypadExitMenuResponse,
+        KeypadChangePinMenuRequest: BaseStationKeypadChangePinMenuResponse,
+        KeypadChangePinConfirmMenuRequest: BaseStationKeypadChangePinConfirmMenuResponse,
+        KeypadAddComponentMenuRequest: BaseStationKeypadAddComponentMenuResponse,
+        KeypadRemoveComponentSelectMenuRequest: BaseStationKeypadRemoveComponentSelectMenuResponse,
+        KeypadAddComponentTypeMenuRequest: BaseStationKeypadAddComponentTypeMenuResponse
+    }
+
+    ADD_COMPONENT_MENU = { # (DeviceType, response class) by add component menu request class
+        KeypadAddKeychainRemoteMenuRequest: (DeviceType.KEYCHAIN_REMOTE, BaseStationKeypadAddKeychainRemoteMenuResponse),
+        KeypadAddPanicButtonMenuRequest: (DeviceType.PANIC_BUTTON, BaseStationKeypadAddPanicButtonMenuResponse),
+        KeypadAddMotionSensorMenuRequest: (DeviceType.MOTION_SENSOR, BaseStationKeypadAddMotionSensorMenuResponse),
+        KeypadAddEntrySensorMenuRequest: (DeviceType.ENTRY_SENSOR, BaseStationKeypadAddEntrySensorMenuResponse),
+        KeypadAddGlassbreakSensorMenuRequest: (DeviceType.GLASSBREAK_SENSOR, BaseStationKeypadAddGlassbreakSensorMenuResponse),
+        KeypadAddCoDetectorMenuRequest: (DeviceType.CO_DETECTOR, BaseStationKeypadAddCoDetectorMenuResponse),
+        KeypadAddSmokeDetectorMenuRequest: (DeviceType.SMOKE_DETECTOR, BaseStationKeypadAddSmokeDetectorMenuResponse),
+        KeypadAddWaterSensorMenuRequest: (DeviceType.WATER_SENSOR, BaseStationKeypadAddWaterSensorMenuResponse),
+        KeypadAddFreezeSensorMenuRequest: (DeviceType.FREEZE_SENSOR, BaseStationKeypadAddFreezeSensorMenuResponse)
+    }
+
+    COMPONENT_SETTINGS = { # Setting enum by component DeviceType
+        DeviceType.KEYPAD: KeypadSetting,
+        DeviceType.KEYCHAIN_REMOTE: KeychainRemoteSetting,
+        DeviceType.PANIC_BUTTON: PanicButtonSetting,
+        DeviceType.MOTION_SENSOR: MotionSensorSetting,
+        DeviceType.ENTRY_SENSOR: EntrySensorSetting,
+        DeviceType.GLASSBREAK_SENSOR: GlassbreakSensorSetting,
+        DeviceType.CO_DETECTOR: CODetectorSetting,
+        DeviceType.SMOKE_DETECTOR: SmokeDetectorSetting,
+        DeviceType.WATER_SENSOR: WaterSensorSetting,
+        DeviceType.FREEZE_SENSOR: FreezeSensorSetting
+    }
+
+    REMOVE_COMPONENT_MENU = { # Remove component scroll menu response class by component DeviceType
+        DeviceType.KEYPAD: BaseStationKeypadRemoveKeypadScrollMenuResponse,
+        DeviceType.KEYCHAIN_REMOTE: BaseStationKeypadRemoveKeychainRemoteScrollMenuResponse,
+        DeviceType.PANIC_BUTTON: BaseStationKeypadRemovePanicButtonScrollMenuResponse,
+        DeviceType.MOTION_SENSOR: BaseStationKeypadRemoveMotionSensorScrollMenuResponse,
+        DeviceType.ENTRY_SENSOR: BaseStationKeypadRemoveEntrySensorScrollMenuResponse,
+        DeviceType.GLASSBREAK_SENSOR: BaseStationKeypadRemoveGlassbreakSensorScrollMenuResponse,
+        DeviceType.CO_DETECTOR: BaseStationKeypadRemoveCoDetectorScrollMenuResponse,
+        DeviceType.SMOKE_DETECTOR: BaseStationKeypadRemoveSmokeDetectorScrollMenuResponse,
+        DeviceType.WATER_SENSOR: BaseStationKeypadRemoveWaterSensorScrollMenuResponse,
+        DeviceType.FREEZE_SENSOR: BaseStationKeypadRemoveFreezeSensorScrollMenuResponse
+    }
+
     def __init__(self, txr: AbstractTransceiver, sn: str, master_pin, **kwargs):
         self.sn = sn
         self.master_pin = master_pin
@@ -115,21 +278,19 @@ class BaseStation(AbstractDevice):
             self.duress_pin = kwargs["duress_pin"]
         else:
             self.duress_pin = None
-        self._pins = []
+        self._pins = {} # Additional PIN dicts keyed by PIN, for constant-time checks
         if "additional_pins" in kwargs and isinstance(kwargs["additional_pins"], list):
-            for i in kwargs["additional_pins"]:
-                d = kwargs["additional_pins"][i]
+            for d in kwargs["additional_pins"]:
                 if "pin" in d:
-                    if "name" in d:
-                        self.add_pin(d.pin, d.name)
-                    else:
-                        self.add_pin(d.pin)
+                    self.add_pin(d["pin"], d.get("name", ""))
                 else:
                     raise ValueError
         self._settings = {"light": BaseStation.Settings.Light.YES, "voice_prompts": BaseStation.Settings.VoicePrompts.YES, "door_chime": BaseStation.Settings.DoorChime.YES, "voice_volume": 35, "siren_volume": 100, "siren_duration": 5, "entry_delay_away": 30, "entry_delay_home": 1, "exit_delay": 45, "dialing_prefix": None}
         if "settings" in kwargs:
             self.settings = kwargs["settings"]
         self._components = {}
+        self._component_order = [] # Serial numbers in enrollment order, for scroll menu indexing
+        self._keypads = set() # Serial numbers of enrolled keypads
         if "components" in kwargs and isinstance(kwargs["components"], list):
             for c in kwargs["components"]:
                 self.add_component(c.get("name", ""), c.get("type"), c.get("sn"), c.get("setting", None), c.get("instant_trip", None))
@@ -137,44 +298,50 @@ class BaseStation(AbstractDevice):
         self._armed = ArmedState.OFF
         self._ess = 0
         self._time_left = 0
+        self._time_left_stop = None
         self._siren_timer = None
-        self._heartbeat_timer()
-        self._test_mode_timer()
+        self._handlers = {} # HANDLERS entry by exact message class, filled on first use
+        self._test_mode = False
         super().__init__(txr, sn)
-        for kp in self.keypads:
-            self._send(BaseStationKeypadPowerOnUpdate(kp.get("sn"), self.sequence, self.sn, self._error_flags, self._armed, self._ess, self._time_left, 0xC)) # TODO: Why 0xC?
-            self._send(BaseStationKeypadTestModeOnUpdate(kp.get("sn"), self.sequence, self.sn))
-            self._send(BaseStationKeypadClearSensorError1Update(kp.get("sn"), self.sequence, self.sn))
-            self._send(BaseStationKeypadClearSensorError2Update(kp.get("sn"), self.sequence, self.sn))
-            self._send(BaseStationKeypadClearSensorError3Update(kp.get("sn"), self.sequence, self.sn))
-            self._send(BaseStationKeypadClearSensorError4Update(kp.get("sn"), self.sequence, self.sn))
+        self._heartbeat_timer()
+        self._repeat(24 * 3600, self._heartbeat_timer) # Queued only once the instance is complete
+        for kp_sn in self._keypads:
+            self._send(BaseStationKeypadPowerOnUpdate(kp_sn, self.sequence, self.sn, self._error_flags, self._armed, self._ess, self._time_left, 0xC)) # TODO: Why 0xC?
+            self._send(BaseStationKeypadTestModeOnUpdate(kp_sn, self.sequence, self.sn))
+            self._send(BaseStationKeypadClearSensorError1Update(kp_sn, self.sequence, self.sn))
+            self._send(BaseStationKeypadClearSensorError2Update(kp_sn, self.sequence, self.sn))
+            self._send(BaseStationKeypadClearSensorError3Update(kp_sn, self.sequence, self.sn))
+            self._send(BaseStationKeypadClearSensorError4Update(kp_sn, self.sequence, self.sn))
 
     def _alarm(self, silent=False):
         self._cancel_countdown()
         if not silent:
-            if self._siren_timer and self._sirent_timer.is_alive():
-                pass # Don't restart siren timer
-            else:
+            if self._siren_timer is None: # Don't restart siren timer
                 self.start_siren()
-                self._siren_timer = Timer(60 * self._settings["siren_duration"], self.stop_siren)
-                self._sirent_timer.start()
+                self._siren_timer = SCHEDULER.enter(60 * self._settings["siren_duration"], self._siren_timeout)
         self.alarm()
 
     def _arm_away(self):
-        self._armed = ArmedStatus.ARMING_AWAY
+        self._armed = ArmedState.ARMING_AWAY
         self._time_left = self._settings['exit_delay']
         self._countdown()
 
     def _arm_home(self):
-        self._armed = ArmedStatus.ARMED_HOME
+        self._armed = ArmedState.ARMED_HOME
         self.arm_home()
 
     def _cancel_countdown(self):
-        if self._time_left_timer is not None and self._time_left_timer.is_alive():
-            self._time_left_timer.cancel()
+        if self._time_left_stop is not None:
+            self._time_left_stop.set()
         self._time_left = 0
 
     def _countdown(self):
+        if self._time_left_stop is not None:
+            self._time_left_stop.set() # Replaces any countdown already running
+        if self._countdown_tick():
+            self._time_left_stop = self._repeat(1, self._countdown_tick)
+
+    def _countdown_tick(self): # Returns whether another tick is due in 1 second
         if not self.is_armed() and not self.is_arming():
             self._cancel_countdown()
         elif self.is_armed():
@@ -183,8 +350,7 @@ class BaseStation(AbstractDevice):
             else:
                 self._time_left -= 1
                 print("{:d} seconds left before alarm".format(self._time_left))
-                self._time_left_timer = Timer(1, self._countdown)
-                self._time_left_timer.start()
+                return True
         elif self.is_arming():
             if self._time_left == 0:
                 self._armed = ArmedState.ARMED_AWAY
@@ -192,200 +358,167 @@ class BaseStation(AbstractDevice):
             else:
                 self._time_left -= 1
                 print("{:d} seconds left before armed".format(self._time_left))
-                self._time_left_timer = Timer(1, self._countdown)
-                self._time_left_timer.start()
+                return True
+        return False
 
     def _disarm(self):
         self._armed = ArmedState.OFF
-        if self._siren_timer and self._siren_timer.is_alive():
-            self._siren_timer.cancel()
+        SCHEDULER.cancel(self._siren_timer)
+        self._siren_timer = None
         self.stop_siren()
         self.disarm()
 
+    def _siren_timeout(self):
+        self._siren_timer = None
+        self.stop_siren()
+
     def _heartbeat_timer(self):
-        for sn in self._components:
-            c = self._components[sn]
-            if 'last_heartbeat' in c:
-                dt = time() - c['last_heartbeat']
-                if dt > self.HEARTBEAT_TIMEOUT:
+        now = time()
+        for sn, c in list(self._components.items()): # Snapshot, as the receive thread may enroll components
+            if now - c.setdefault('last_heartbeat', now) > self.HEARTBEAT_TIMEOUT:
+                try:
                     self.alert(self.AlertType.SENSOR_NOT_RESPONDING, sn)
-            else:
-                c['last_heartbeat'] = time()
-                self._components.update({sn: c})
-            Timer(24 * 3600, self._heartbeat_timer).start()
+                except Exception:
+                    print_exc() # A failing hook must not end the daily check
+        return True # Keep checking daily
 
     def _process_msg(self, msg: Message):
         if isinstance(msg, BaseStationKeypadMessage):
             return # BaseStations do not accept BaseStationKeypad Messages
-        if not msg.sn in self._components:
-            return # Component not enrolled
         c = self._components.get(msg.sn)
-        setting = c.get('setting')
-        if isinstance(msg, KeypadMessage):
-            if isinstance(msg, KeypadRemoveComponentScrollMenuRequest) or isinstance(msg, KeypadRemoveComponentMenuRequest):
-                if isinstance(msg, KeypadRemoveComponentScrollMenuRequest):
-                    n = msg.n
-                else:
-                    n = 0
-                c_sn = list(self._components)[n]
-                c_type = self._components.get(c_sn).get('type')
-                left_arrow = n != 0
-                right_arrow = (len(self._components) - 1) != n
-                if c_type == DeviceType.KEYPAD:
-                    self._send(BaseStationKeypadRemoveKeypadScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.KEYCHAIN_REMOTE:
-                    self._send(BaseStationKeypadRemoveKeychainRemoteScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.PANIC_BUTTON:
-                    self._send(BaseStationKeypadRemovePanicButtonScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.MOTION_SENSOR:
-                    self._send(BaseStationKeypadRemoveMotionSensorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.ENTRY_SENSOR:
-                    self._send(BaseStationKeypadRemoveEntrySensorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.GLASSBREAK_SENSOR:
-                    self._send(BaseStationKeypadRemoveGlassbreakSensorScrolMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.CO_DETECTOR:
-                    self._send(BaseStationKeypadRemoveCoDetectorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.SMOKE_DETECTOR:
-                    self._send(BaseStationKeypadRemoveSmokeDetectorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.WATER_SENSOR:
-                    self._send(BaseStationKeypadRemoveWaterSensorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                elif c_type == DeviceType.FREEZE_SENSOR:
-                    self._send(BaseStationKeypadRemoveFreezeSensorScrollMenuResponse(msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
-                else:
-                    raise NotImplementedError(str(c_type))
-            elif isinstance(msg, KeypadAlarmPinRequest):
-                if msg.pin == self.duress_pin or  msg.pin == self.master_pin or any(d['pin'] == msg.pin for d in self.pins):
-                    self._send(BaseStationKeypadAlarmPinResponse(msg.sn, self.sequence, self.sn, BaseStationKeypadAlarmPinResponse.ResponseType.DISARM)) # TODO: Respond with alarm source, if any
-                    self._disarm()
-                    if msg.pin == self.duress_pin:
-                        self._alarm(True)
-                else:
-                    self._send(BaseStationKeypadAlarmPinResponse(msg.sn, self.sequence, self.sn, BaseStationKeypadAlarmPinResponse.ResponseType.INVALID))
-            elif isinstance(msg, KeypadMenuPinRequest):
-                if msg.pin == self.master_pin:
-                    self._send(BaseStationKeypadValidMenuPinResponse(msg.sn, self.sequence))
-                else:
-                    self._send(BaseStationKeypadInvalidMenuPinResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadNewPinRequest):
-                self._master_pin = msg.pin
-            elif isinstance(msg, KeypadExtendedStatusRequest):
-                self._send(BaseStationKeypadExtendedStatusResponse(msg.sn, self.sequence, self.sn, self._error_flags, self._armed, self._ess, self._time_left))
-            elif isinstance(msg, KeypadTestModeOnRequest):
-                self._test_mode = True # TODO: Test Mode
-                self._send(BaseStationKeypadTestModeOnResponse(msg.sn, self.sequence, self.sn))
-            elif isinstance(msg, KeypadTestModeOffRequest):
-                self._test_mode = False
-                self._send(BaseStationKeypadTestModeOffResponse(msg.sn, self.sequence, self.sn))
-            elif isinstance(msg, KeypadHomeRequest):
-                self._arm_home()
-                self._send(BaseStationKeypadHomeResponse(msg.sn, self.sequence, self.sn))
-            elif isinstance(msg, KeypadPanicRequest):
-                if setting == self.KeypadSetting.PANIC_ENABLED:
-                    self._alarm()
-            elif isinstance(msg, KeypadAwayRequest):
-                self._arm_away()
-                self._send(BaseStationKeypadAwayResponse(msg.sn, self.sequence, self.sn))
-            elif isinstance(msg, KeypadOffRequest):
-                self._send(BaseStationKeypadOffRequest(msg.sn, self.sequence, self.sn))
-            elif isinstance(msg, KeypadEnterMenuRequest):
-                self._send(BaseStationKeypadEnterMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadExitMenuRequest):
-                self._send(BaseStationKeypadExitMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadChangePinMenuRequest):
-                self._send(BaseStationKeypadChangePinMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadChangePinConfirmMenuRequest):
-                self._send(BaseStationKeypadChangePinConfirmMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadAddComponentMenuRequest):
-                self._send(BaseStationKeypadAddComponentMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadRemoveComponentSelectMenuRequest):
-                self._send(BaseStationKeypadRemoveComponentSelectMenuResponse(msg.sn, self.sequence))
-            elif isinstance(msg, KeypadAddComponentLastTypeMenuRequest):
-                 pass # TODO
-            elif isinstance(msg, KeypadPrefixRequest):
-                self._settings.update({'dialing_prefix': msg.prefix})
-                self._send(BaseStationKeypadNewPrefixResponse(msg.sn, self.sequence))
-            elif isinstance(msg, AbstractKeypadModifyComponentMenuRequest):
-                if isinstance(msg, KeypadRemoveComponentConfirmMenuRequest):
-                    self.remove_component(msg.c_sn)
-                    self._send(BaseStationKeypadRemoveComponentConfirmMenuResponse(msg.sn, self.sequence))
-                else:
-                    if msg.c_sn in self._components: # Check DeviceType?
-                       response_type = AbstractBaseStationKeypadAddComponentSerialMenuResponse.ResponseType.COMPONENT_ALREADY_ADDED
-                    else:
-                        if isinstance(msg, KeypadAddKeypadMenuRequest):
-                            c_type = DeviceType.KEYPAD
-                            msg_class = BaseStationKeypadAddKeypadMenuResponse
-                        elif isinstance(msg, KeypaddAddKeychainRemoteMenuRequest):
-                            c_type = DeviceType.KEYCHAIN_REMOTE
-                            msg_class = BaseStationKeypadAddKeychainRemoteMenuResponse
-                        elif isinstance(msg, KeypadAddPanicButtonMenuRequest):
-                            c_type = DeviceType.PANIC_BUTTON
-                            msg_class = BaseStationkeypadAddPanicButtonMenuResponse
-                        elif isinstance(msg, KeypadAddMotionSensorMenuRequest):
-                            c_type = DeviceType.MOTION_SENSOR
-                            msg_class = BaseStationKeypadAddMotionSensorMenuResponse
-                        elif isinstance(msg, KeypadAddEntrySensorMenuRequest):
-                            c_type = DeviceType.ENTRY_SENSOR
-                            msg_class = BaseStationKeypadAddEntrySensorMenuResponse
-                        elif isinstance(msg, KeypadAddGlassbreakSensorMenuRequest):
-                            c_type = DeviceType.GLASSBREAK_SENSOR
-                            msg_class = BaseStationKeypadAddGlassbreakSensorMenuResponse
-                        elif isisntance(msg, KeypadAddCoDetectorMenuRequest):
-                            c_type = DeviceType.CO_DETECTOR
-                            msg_class = BaseStationKeypadAddCoDetectorMenuResponse
-                        elif isinstance(msg, KeypadAddSmokeDetectorMenuRequest):
-                            c_type = DeviceType.SMOKE_DETECTOR
-                            msg_class = BaseStationKeypadAddSmokeDetectorMenuResponse
-                        elif isinstance(msg, KeypadAddWaterSensorMenuRequest):
-                            c_type = DeviceType.WATER_SENSOR
-                            msg_class = BaseStationKeypadAddWaterSensorMenuResponse
-                        elif isinstance(msg, KeypadAddFreezeSensorMenuRequest):
-                            c_type = DeviceType.FREEZE_SENSOR
-                            msg_class = BaseStationKeypadAddFreezeSensorMenuResponse
-                        else:
-                            raise NotImplementedError
-                        self.add_component("", c_type, msg.c_sn)
-                        response_type = AbstractBaseStationKeypadAddComponentSerialMenuResponse.ResponseType.COMPONENT_ADDED
-                    self._send(msg_class(msg.sn, self.sequence, response_type))
-            elif isinstance(msg, KeypadAddComponentTypeMenuRequest):
-                self._send(BaseStationKeypadAddComponentTypeMenuResponse(msg.sn, self.sequence))
-        elif isinstance(msg, KeychainRemoteMessage):
-            if not (setting == self.KeychainRemoteSetting.DISABLED):
-                if msg.event_type == KeychainRemoteMessage.EventType.PANIC:
-                    if not (setting == self.KeychainRemoteSetting.PANIC_DISABLED):
-                        self._alarm()
-                elif msg.event_type == KeychainRemoteMessage.EventType.AWAY:
-                    self._arm_away()
-                elif msg.event_type == KeychainRemoteMessage.EventType.OFF:
-                    self._disarm()
-        elif isinstance(msg, PanicButtonMessage):
-            if msg.event_type == PanicButtonMessage.EventType.PANIC:
-                if setting == self.PanicButtonSetting.AUDIBLE_ALARM:
-                    self._alarm()
-                elif setting == self.PaicButtonSetting.SILENT_ALARM:
-                    self._alarm(True)
-        elif isinstance(msg, MotionSensorMessage):
-            if msg.event_type == MotionSensorMessage.EventType.MOTION:
-                if ((setting == self.MotionSensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
-                    or (setting == self.MotionSensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
-                    self._trip(self._alarm, c.get('instant_trip'))
-                elif setting == self.MotionSensorSetting.NO_ALARM_ALERT_ONLY and self.is_armed():
-                    self._trip(self._alert, c.get('instant_trip'))
-        elif isinstance(msg, EntrySensorMessage):
-            if msg.event_type == EntrySensorMessage.EventType.OPEN:
-                if ((setting == self.EntrySensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
-                    or (setting == self.EntrySensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
-                    self._trip(self._alarm, c.get('instant_trip'))
-                elif setting == self.EntrySensorSetting.NO_ALARM_ALERT_ONLY and self.is_armed():
-                    self._trip(self._alert, c.get('instant_trip'))
-        elif isinstance(msg, GlassbreakSensorMessage):
-            if msg.event_type == GlassbreakSensorMessage.EventType.GLASSBREAK:
-                if ((setting == self.GlassbreakSensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
-                    or (setting == self.GlassbreakSensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
-                    self._trip(self._alarm, c.get('instant_trip'))
+        if c is None:
+            return # Component not enrolled
+        c['last_heartbeat'] = time()
+        msg_cls = type(msg)
+        handler = self._handlers.get(msg_cls)
+        if handler is None: # Nearest listed class in the MRO, resolved once per message class
+            handler = self._handlers[msg_cls] = next(self.HANDLERS[base] for base in msg_cls.__mro__ if base in self.HANDLERS)
+        getattr(self, handler)(msg, c, c.get('setting'))
+
+    def _process_unhandled_msg(self, msg: Message, c: dict, setting):
+        raise NotImplementedError
+
+    def _process_ignored_msg(self, msg: Message, c: dict, setting):
+        pass
+
+    def _process_menu_request(self, msg: KeypadMessage, c: dict, setting):
+        self._send(self.MENU_RESPONSES[type(msg)](msg.sn, self.sequence))
+
+    def _process_remove_component_menu_request(self, msg: KeypadMessage, c: dict, setting):
+        if isinstance(msg, KeypadRemoveComponentScrollMenuRequest):
+            n = msg.n
         else:
+            n = 0
+        c_sn = self._component_order[n]
+        c_type = self._components.get(c_sn).get('type')
+        left_arrow = n != 0
+        right_arrow = (len(self._component_order) - 1) != n
+        if c_type not in self.REMOVE_COMPONENT_MENU:
+            raise NotImplementedError(str(c_type))
+        self._send(self.REMOVE_COMPONENT_MENU[c_type](msg.sn, self.sequence, c_sn, left_arrow, right_arrow))
+
+    def _process_alarm_pin_request(self, msg: KeypadAlarmPinRequest, c: dict, setting):
+        if msg.pin == self.duress_pin or msg.pin == self.master_pin or msg.pin in self._pins:
+            self._send(BaseStationKeypadAlarmPinResponse(msg.sn, self.sequence, self.sn, BaseStationKeypadAlarmPinResponse.ResponseType.DISARM)) # TODO: Respond with alarm source, if any
+            self._disarm()
+            if msg.pin == self.duress_pin:
+                self._alarm(True)
+        else:
+            self._send(BaseStationKeypadAlarmPinResponse(msg.sn, self.sequence, self.sn, BaseStationKeypadAlarmPinResponse.ResponseType.INVALID))
+
+    def _process_menu_pin_request(self, msg: KeypadMenuPinRequest, c: dict, setting):
+        if msg.pin == self.master_pin:
+            self._send(BaseStationKeypadValidMenuPinResponse(msg.sn, self.sequence))
+        else:
+            self._send(BaseStationKeypadInvalidMenuPinResponse(msg.sn, self.sequence))
+
+    def _process_new_pin_request(self, msg: KeypadNewPinRequest, c: dict, setting):
+        self._master_pin = msg.pin
+
+    def _process_extended_status_request(self, msg: KeypadExtendedStatusRequest, c: dict, setting):
+        self._send(BaseStationKeypadExtendedStatusResponse(msg.sn, self.sequence, self.sn, self._error_flags, self._armed, self._ess, self._time_left))
+
+    def _process_test_mode_on_request(self, msg: KeypadTestModeOnRequest, c: dict, setting):
+        self._test_mode = True # TODO: Test Mode
+        self._send(BaseStationKeypadTestModeOnResponse(msg.sn, self.sequence, self.sn))
+
+    def _process_test_mode_off_request(self, msg: KeypadTestModeOffRequest, c: dict, setting):
+        self._test_mode = False
+        self._send(BaseStationKeypadTestModeOffResponse(msg.sn, self.sequence, self.sn))
+
+    def _process_home_request(self, msg: KeypadHomeRequest, c: dict, setting):
+        self._arm_home()
+        self._send(BaseStationKeypadHomeResponse(msg.sn, self.sequence, self.sn))
+
+    def _process_panic_request(self, msg: KeypadPanicRequest, c: dict, setting):
+        if setting == self.KeypadSetting.PANIC_ENABLED:
+            self._alarm()
+
+    def _process_away_request(self, msg: KeypadAwayRequest, c: dict, setting):
+        self._arm_away()
+        self._send(BaseStationKeypadAwayResponse(msg.sn, self.sequence, self.sn))
+
+    def _process_off_request(self, msg: KeypadOffRequest, c: dict, setting):
+        self._send(BaseStationKeypadOffResponse(msg.sn, self.sequence, self.sn))
+
+    def _process_prefix_request(self, msg: KeypadPrefixRequest, c: dict, setting):
+        self._settings.update({'dialing_prefix': msg.prefix})
+        self._send(BaseStationKeypadNewPrefixResponse(msg.sn, self.sequence))
+
+    def _process_remove_component_confirm_menu_request(self, msg: KeypadRemoveComponentConfirmMenuRequest, c: dict, setting):
+        self.remove_component(msg.c_sn)
+        self._send(BaseStationKeypadRemoveComponentConfirmMenuResponse(msg.sn, self.sequence))
+
+    def _process_add_component_menu_request(self, msg: KeypadModifyComponentMenuRequest, c: dict, setting):
+        if type(msg) not in self.ADD_COMPONENT_MENU:
             raise NotImplementedError
-    
+        (c_type, msg_class) = self.ADD_COMPONENT_MENU[type(msg)]
+        if msg.c_sn in self._components: # Check DeviceType?
+            response_type = BaseStationKeypadAddComponentSerialMenuResponse.ResponseType.COMPONENT_ALREADY_ADDED
+        else:
+            self.add_component("", c_type, msg.c_sn)
+            response_type = BaseStationKeypadAddComponentSerialMenuResponse.ResponseType.COMPONENT_ADDED
+        self._send(msg_class(msg.sn, self.sequence, response_type))
+
+    def _process_keychain_remote_msg(self, msg: KeychainRemoteMessage, c: dict, setting):
+        if not (setting == self.KeychainRemoteSetting.DISABLED):
+            if msg.event_type == KeychainRemoteMessage.EventType.PANIC:
+                if not (setting == self.KeychainRemoteSetting.PANIC_DISABLED):
+                    self._alarm()
+            elif msg.event_type == KeychainRemoteMessage.EventType.AWAY:
+                self._arm_away()
+            elif msg.event_type == KeychainRemoteMessage.EventType.OFF:
+                self._disarm()
+
+    def _process_panic_button_msg(self, msg: PanicButtonMessage, c: dict, setting):
+        if msg.event_type == PanicButtonMessage.EventType.BUTTON_PRESS:
+            if setting == self.PanicButtonSetting.AUDIBLE_ALARM:
+                self._alarm()
+            elif setting == self.PanicButtonSetting.SILENT_ALARM:
+                self._alarm(True)
+
+    def _process_motion_sensor_msg(self, msg: MotionSensorMessage, c: dict, setting):
+        if msg.event_type == MotionSensorMessage.EventType.MOTION:
+            if ((setting == self.MotionSensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
+                or (setting == self.MotionSensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
+                self._trip(self._alarm, c.get('instant_trip'))
+            elif setting == self.MotionSensorSetting.NO_ALARM_ALERT_ONLY and self.is_armed():
+                self._trip(self._alert, c.get('instant_trip'))
+
+    def _process_entry_sensor_msg(self, msg: EntrySensorMessage, c: dict, setting):
+        if msg.event_type == EntrySensorMessage.EventType.OPEN:
+            if ((setting == self.EntrySensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
+                or (setting == self.EntrySensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
+                self._trip(self._alarm, c.get('instant_trip'))
+            elif setting == self.EntrySensorSetting.NO_ALARM_ALERT_ONLY and self.is_armed():
+                self._trip(self._alert, c.get('instant_trip'))
+
+    def _process_glassbreak_sensor_msg(self, msg: GlassbreakSensorMessage, c: dict, setting):
+        if msg.event_type == GlassbreakSensorMessage.EventType.GLASSBREAK:
+            if ((setting == self.GlassbreakSensorSetting.ALARM_HOME_AND_AWAY and self.is_armed())
+                or (setting == self.GlassbreakSensorSetting.ALARM_AWAY_ONLY and self.is_armed_away())):
+                self._trip(self._alarm, c.get('instant_trip'))
+
     def _trip(self, trip_function, instant_trip=False):
         if instant_trip:
             trip_function()
@@ -400,41 +533,27 @@ class BaseStation(AbstractDevice):
         name = name[:22] # Maxlength of 22
         if cls == DeviceType.BASE_STATION:
             raise RuntimeException("Must be a Component")
-        if cls == DeviceType.KEYPAD:
-            setting = self.KeypadSetting(setting)
-        elif cls == DeviceType.KEYCHAIN_REMOTE:
-            setting = self.KeychainRemoteSetting(setting)
-        elif cls == DeviceType.MOTION_SENSOR:
-            setting = self.MotionSensorSetting(setting)
-        elif cls == DeviceType.ENTRY_SENSOR:
-            setting = self.EntrySensorSetting(setting)
-        elif cls == DeviceType.GLASSBREAK_SENSOR:
-            setting = self.GlassbreakSensorSetting(setting)
-        elif cls == DeviceType.CO_DETECTOR:
-            setting = self.CoDetectorSetting(setting)
-        elif cls == DeviceType.SMOKE_DETECTOR:
-            setting = self.SmokeDetectorSetting(setting)
-        elif cls == DeviceType.WATER_SENSOR:
-            setting = self.WaterSensorSetting(setting)
-        elif cls == DeviceType.FREEZE_SENSOR:
-            setting = self.FreezeSensorSetting(setting)
+        if cls in self.COMPONENT_SETTINGS:
+            setting = self.COMPONENT_SETTINGS[cls](setting)
         if cls in [DeviceType.ENTRY_SENSOR, DeviceType.MOTION_SENSOR, DeviceType.GLASSBREAK_SENSOR]:
             instant_trigger = bool(instant_trigger)
         else:
             instant_trigger = None
+        if sn not in self._components:
+            self._component_order.append(sn)
+        if cls == DeviceType.KEYPAD:
+            self._keypads.add(sn)
+        else:
+            self._keypads.discard(sn)
         self._components.update({sn: {"name": name, "type": cls, "setting": setting, "instat_trigger": instant_trigger}})
 
     def add_pin(self, pin, name: str=''):
-        self._pins.update({"name": name, "pin": Validator.pin(pin)})
+        pin = Validator.pin(pin)
+        self._pins[pin] = {"name": name, "pin": pin}
 
     @property
     def components(self):
-        components = []
-        for i in self._components:
-            c = self._components[i]
-            c["sn"] = i
-            components.append(c)
-        return components
+        return [dict(self._components[sn], sn=sn) for sn in self._component_order]
 
     @property
     def duress_pin(self):
@@ -461,7 +580,7 @@ class BaseStation(AbstractDevice):
 
     @property
     def keypads(self):
-        return {k: v for k, v in self.components.items() if v["type"] == DeviceType.KEYPAD}
+        return [dict(self._components[sn], sn=sn) for sn in self._component_order if sn in self._keypads]
 
     @property
     def master_pin(self):
@@ -473,14 +592,16 @@ class BaseStation(AbstractDevice):
 
     @property
     def pins(self):
-        return self._pins
+        return list(self._pins.values())
 
     def remove_component(self, sn):
         if sn in self._components:
             self._components.pop(sn)
+            self._component_order.remove(sn)
+            self._keypads.discard(sn)
 
     def remove_pin(self, d):
-        del self._pins[d["name"]]
+        del self._pins[d["pin"]]
 
     @property
     def settings(self):
@@ -534,8 +655,8 @@ class BaseStation(AbstractDevice):
     def alarm(self):
         pass # Called when alarm is triggered
 
-    def alert(self):
-        pass # Called when voice alert is triggered
+    def alert(self, alert_type: str, sn: str):
+        pass # Called when voice alert is triggered, with an AlertType and the component serial number
 
     def arm_away(self):
         pass # Called when system is armed (away, after delay)
@@ -594,42 +715,78 @@ class Keypad(Component):
         WATER_SENSOR = 'Water Sensor'
         FREEZE_SENSOR = 'Freeze Sensor'
 
+    ADD_COMPONENT_NEXT = { # Add Component menu page shown after each page; the last page has no successor
+        AddComponentMenu.ENTRY_SENSOR: AddComponentMenu.MOTION_SENSOR,
+        AddComponentMenu.MOTION_SENSOR: AddComponentMenu.PANIC_BUTTON,
+        AddComponentMenu.PANIC_BUTTON: AddComponentMenu.KEYPAD,
+        AddComponentMenu.KEYPAD: AddComponentMenu.KEYCHAIN_REMOTE,
+        AddComponentMenu.KEYCHAIN_REMOTE: AddComponentMenu.GLASSBREAK_SENSOR,
+        AddComponentMenu.GLASSBREAK_SENSOR: AddComponentMenu.CO_DETECTOR,
+        AddComponentMenu.CO_DETECTOR: AddComponentMenu.SMOKE_DETECTOR,
+        AddComponentMenu.SMOKE_DETECTOR: AddComponentMenu.WATER_SENSOR,
+        AddComponentMenu.WATER_SENSOR: AddComponentMenu.FREEZE_SENSOR
+    }
+
+    HANDLERS = { # _process_msg handler names by message class; other classes use their nearest base listed here
+        BaseStationKeypadMessage: None, # Not handled, so not redisplayed
+        BaseStationKeypadExtendedStatusResponse: '_process_extended_status_msg',
+        BaseStationKeypadExtendedStatusUpdate: '_process_extended_status_msg',
+        BaseStationKeypadExtendedStatusRemoteUpdate: '_process_extended_status_msg',
+        BaseStationKeypadStatusUpdate: '_process_status_update',
+        BaseStationKeypadAlarmPinResponse: '_process_ignored_msg',
+        BaseStationKeypadInvalidMenuPinResponse: '_process_invalid_menu_pin_response',
+        BaseStationKeypadValidMenuPinResponse: '_process_valid_menu_pin_response',
+        BaseStationKeypadHomeResponse: '_process_ignored_msg',
+        BaseStationKeypadAwayResponse: '_process_ignored_msg',
+        BaseStationKeypadOffRemoteUpdate: '_process_ignored_msg',
+        BaseStationKeypadEnterMenuResponse: '_process_enter_menu_response',
+        BaseStationKeypadNewPrefixResponse: '_process_ignored_msg'
+        # To be continued
+    }
+
     def __init__(self, txr: AbstractTransceiver, sn: str):
         self._page = self.Page.BOOT
         self._menu_page = None
         self._add_component_menu_page = None
         self._remove_component_menu_page = None
         self._backlight_timer = None
-        self._time_left_timer = None
+        self._enter_menu_timer = None
+        self._time_left_stop = None
+        self._handlers = {} # HANDLERS entry by exact message class, filled on first use
+        self._entry_buffer = ''
         self.error_flags = None
-        self.armed = None
+        self._armed = None # Unknown until the base station reports it
         self.ess = None
-        self.time_left = None
+        self._time_left = 0
         super().__init__(txr, sn)
         self._display(False)
         self._send(KeypadExtendedStatusRequest(self.sn, self.sequence))
 
     def _cancel_countdown(self):
-        if self._time_left_timer is not None and self._time_left_timer.is_alive():
-            self._time_left_timer.cancel()
+        if self._time_left_stop is not None:
+            self._time_left_stop.set()
         self._time_left = 0
 
     def _countdown(self):
+        if self._time_left_stop is not None:
+            self._time_left_stop.set() # Replaces any countdown already running
+        if self._countdown_tick():
+            self._time_left_stop = self._repeat(1, self._countdown_tick)
+
+    def _countdown_tick(self): # Returns whether another tick is due in 1 second
         if not self.is_armed() and not self.is_arming():
             self._cancel_countdown()
         elif self._time_left != 0:
             self._time_left -= 1
-            self._time_left_timer = Timer(1, self._countdown)
-            self._time_left_timer.start()
             self.warning_beep()
+            return True
+        return False
 
     def _display(self, backlight: bool=True):
-        if self._backlight_timer and self._backlight_timer.is_alive():
-            self._backlight_timer.cancel()
+        SCHEDULER.cancel(self._backlight_timer)
         self.backlight(backlight)
         if backlight:
-            self._backlight_timer = Timer(20, self.backlight, [False])
-            self._backlight_timer.start()
+            self._backlight_timer = SCHEDULER.enter(20, self.backlight, False)
         self.display()
 
     def _inc(self):
@@ -647,31 +804,12 @@ class Keypad(Component):
         elif self._menu_page == Keypad.Menu.ADD_COMPONENT:
             if self._add_component_menu_page is None:
                 self._menu_page = Keypad.Menu.REMOVE_COMPONENT
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.ENTRY_SENSOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.MOTION_SENSOR
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.MOTION_SENSOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.PANIC_BUTTON
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.PANIC_BUTTON:
-                self._add_component_menu_page = Keypad.AddComponentMenu.KEYPAD
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.KEYPAD:
-                self._add_component_menu_page = Keypad.AddComponentMenu.KEYCHAIN_REMOTE
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.KEYCHAIN_REMOTE:
-                self._add_component_menu_page = Keypad.AddComponentMenu.GLASSBREAK_SENSOR
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.GLASSBREAK_SENSOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.CO_DETECTOR
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.CO_DETECTOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.SMOKE_DETECTOR
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.SMOKE_DETECTOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.WATER_SENSOR
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.WATER_SENSOR:
-                self._add_component_menu_page = Keypad.AddComponentMenu.FREEZE_SENSOR
-                msg = KeypadAddComponentLastTypeMenuRequest(self.sn, self.sequence)
-                self._send(msg)
-                Timer(1, self._send, [msg])
-                Timer(2, self._send, [msg])
-            elif self._add_component_menu_page == Keypad.AddComponentMenu.FREEZE_SENSOR:
-                pass
-            else:
+            elif self._add_component_menu_page in self.ADD_COMPONENT_NEXT:
+                page = self._add_component_menu_page
+                self._add_component_menu_page = self.ADD_COMPONENT_NEXT[page]
+                if page is Keypad.AddComponentMenu.WATER_SENSOR:
+                    self._send_add_component_last_type()
+            elif self._add_component_menu_page != Keypad.AddComponentMenu.FREEZE_SENSOR:
                 raise RuntimeError("Unknown Add Component Menu Page")
         elif self._menu_page == Keypad.Menu.REMOVE_COMPONENT:
             if self._remove_component_menu_page is None:
@@ -685,6 +823,24 @@ class Keypad(Component):
             pass
         self._display()
 
+    def _send_add_component_last_type(self):
+        msg = KeypadAddComponentLastTypeMenuRequest(self.sn, self.sequence)
+        self._send(msg)
+        SCHEDULER.enter(1, self._send, msg)
+        SCHEDULER.enter(2, self._send, msg)
+
+    def _menu_cancel(self):
+        SCHEDULER.cancel(self._enter_menu_timer)
+        self._enter_menu_timer = None
+        if self.in_menu():
+            self._send(KeypadExitMenuRequest(self.sn, self.sequence))
+        self._menu_page = None
+        self._add_component_menu_page = None
+        self._remove_component_menu_page = None
+        self._entry_buffer = ''
+        self._page = Keypad.Page.ALARM_STATE
+        self._display()
+
     def _menu_prev(self):
         pass # TODO
 
@@ -693,40 +849,43 @@ class Keypad(Component):
             return
         if msg.sn != self.sn:
             return
-        if isinstance(msg, (BaseStationKeypadExtendedStatusResponse, BaseStationKeypadExtendedStatusUpdate, BaseStationKeypadExtendedStatusRemoteUpdate)):
-            self.error_flags = msg.flags
-            self.armed = msg.armed
-            self.ess = msg.ess
-            self.time_left = msg.tl
-            self._countdown()
-        elif isinstance(msg, BaseStationKeypadStatusUpdate):
-            self.error_flags = msg.flags
-        elif isinstance(msg, BaseStationKeypadDisarmPinResponse):
-            pass
-        elif isinstance(msg, BaseStationKeypadInvalidMenuPinResponse):
-            self._enter_menu_timer.cancel()
-            self._entry_buffer = ''
-            self._page = Keypad.Page.ENTER_MENU_PIN
-            self._enter_menu_timer = Time(5, self._menu_cancel)
-        elif isinstance(msg, BaseStationKeypadValidMenuPinResponse):
-            self._enter_menu_timer.cancel()
-            self._menu_page = Keypad.Menu.CHANGE_PIN
-        elif isinstance(msg, BaseStationKeypadHomeResponse):
-            pass
-        elif isinstance(msg, BaseStationKeypadAwayResponse):
-            pass
-        elif isinstance(msg, BaseStationKeypadOffRemoteUpdate):
-            pass
-        elif isinstance(msg, BaseStationKeypadEnterMenuResponse):
-            self._page = Keypad.Page.ENTER_MENU_PIN
-            self._enter_menu_timer = Timer(5, self._menu_cancel)
-        elif isinstance(msg, BaseStationKeypadNewPrefixResponse):
-            pass
-        # To be continued
-        else:
+        msg_cls = type(msg)
+        if msg_cls not in self._handlers: # Nearest listed class in the MRO, resolved once per message class
+            self._handlers[msg_cls] = next(self.HANDLERS[base] for base in msg_cls.__mro__ if base in self.HANDLERS)
+        handler = self._handlers[msg_cls]
+        if handler is None:
             return
+        getattr(self, handler)(msg)
         self._display()
 
+    def _process_ignored_msg(self, msg: BaseStationKeypadMessage):
+        pass
+
+    def _process_extended_status_msg(self, msg: BaseStationKeypadMessage):
+        self.error_flags = msg.flags
+        self._armed = msg.armed
+        self.ess = msg.ess
+        self._time_left = msg.tl
+        self._countdown()
+
+    def _process_status_update(self, msg: BaseStationKeypadStatusUpdate):
+        self.error_flags = msg.flags
+
+    def _process_invalid_menu_pin_response(self, msg: BaseStationKeypadInvalidMenuPinResponse):
+        SCHEDULER.cancel(self._enter_menu_timer)
+        self._entry_buffer = ''
+        self._page = Keypad.Page.ENTER_MENU_PIN
+        self._enter_menu_timer = SCHEDULER.enter(5, self._menu_cancel)
+
+    def _process_valid_menu_pin_response(self, msg: BaseStationKeypadValidMenuPinResponse):
+        SCHEDULER.cancel(self._enter_menu_timer)
+        self._menu_page = Keypad.Menu.CHANGE_PIN
+
+    def _process_enter_menu_response(self, msg: BaseStationKeypadEnterMenuResponse):
+        self._entry_buffer = ''
+        self._page = Keypad.Page.ENTER_MENU_PIN
+        self._enter_menu_timer = SCHEDULER.enter(5, self._menu_cancel)
+
     # Utility functions
     def in_menu(self):
         return self._menu_page is not None
@@ -755,7 +914,7 @@ class Keypad(Component):
             mode = Keypad.Mode.OFF
         elif self._armed == ArmedState.ARMING_AWAY or self._armed == ArmedState.ARMED_AWAY:
             mode = Keypad.Mode.AWAY
-        elif self._armed == ArmedState.ARMING_HOME or self._armed == ArmedState.ARMED_HOME:
+        elif self._armed == ArmedState.ARMED_HOME: # No ARMING_HOME state (home arms immediately)
             mode = Keypad.Mode.HOME
         else:
             raise RuntimeError
@@ -791,7 +950,7 @@ class Keypad(Component):
         n = int(n)
         if not 0 <= n <= 9:
             raise ValueError
-        if self.page == Keypad.Page.ALARM_STATUS or self.page == Keypad.Page.SENSOR_ERROR:
+        if self.page == Keypad.Page.ALARM_STATE or self.page == Keypad.Page.SENSOR_ERROR:
             self._entry_buffer = str(n)
             self._page = Keypad.Page.ENTER_DISARM_PIN
         elif self.page == Keypad.Page.ENTER_DISARM_PIN:
@@ -816,7 +975,7 @@ class Keypad(Component):
             self._entry_buffer = self._entry_buffer[:-1]
             self._display()
         elif self.in_menu():
-            self._prev()
+            self._menu_prev()
         self.button_beep()
 
     # Implementation-specific functions to be overridden by subclasses
@@ -835,15 +994,14 @@ class Keypad(Component):
 
 class Sensor(Component):
 
+    receiver = False # Sensors do not receive messages
+
     def __init__(self, txr: AbstractTransceiver, sn: str):
         self._current_msg = None # Repeated message
         self._t = None # Timer object for repeated message
         self._tx_count = 0 # Number of repeated transmissions
         super().__init__(txr, sn)
 
-    def _recv(self):
-        return # Sensors do not receive messages
-
     def _send(self, msg: SensorMessage):
         if msg == self._current_msg:
             self._t.cancel() # Abort repeated (old) message and send new message
@@ -1,7 +1,21 @@
 #!/usr/bin/python3
 from simplisafe import *
+from copy import copy
+from functools import cached_property, lru_cache
+from operator import attrgetter
 import struct
 
+_FRAMES = tuple(struct.Struct(">HB5s{:d}sB".format(n)) for n in range(8)) # Vendor code, payload length code, serial number, payload and checksum, by payload length
+_BYTES = tuple(bytes([i]) for i in range(256)) # Preallocated single-byte objects, indexed by value
+_UINT8_PAIR = struct.Struct(">BB")
+_UINT8_QUAD = struct.Struct(">BBBB")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_HEX_LO = tuple("{:X}".format(i & 0xF) for i in range(256)) # Hex digit of each byte's low nibble
+_HEX_HI = tuple("{:X}".format(i >> 4) for i in range(256)) # Hex digit of each byte's high nibble
+_PIN_DIGITS = tuple(str(i & 0xF) + str(i >> 4) for i in range(256)) # PIN digit pair stuffed in each byte, low nibble first
+_PIN_BYTES = {str(lo) + str(hi): (hi << 4) | lo for hi in range(10) for lo in range(10)} # Inverse of _PIN_DIGITS for decimal digits
+
 class SerialNumberFormat:
     ASCII_4B5C = "4-byte-encoded 5-alphanumeric-character serial number" # Algorithm can process ASCII chars 0-9A-Za-n; TODO: see if keypad will display a-n
     HEX_5B6C = "5-byte-encoded 6-hexadecimal-character serial number"
@@ -11,28 +25,11 @@ class SerialNumberFormat:
         if fmt == cls.ASCII_4B5C:
             if len(buffer) < 4:
                 raise ValueError
-            b = [((buffer[2] >> 0) & 0x30) | (buffer[0] & 0xF)]
-            b.append(((buffer[2] >> 2) & 0x30) | (buffer[0] >> 4))
-            b.append(((buffer[3] << 4) & 0x30) | (buffer[1] & 0xF))
-            b.append(((buffer[3] << 2) & 0x30) | (buffer[1] >> 4))
-            b.append(((buffer[3] << 0) & 0x30) | (buffer[2] & 0xF))
-            sn = ""
-            for c in b:
-                if c == 0x3F: # Blank
-                    break
-                sn += chr(c + 0x30)
-            hb = bool(buffer[3] & 0x80) # High bit (bit 7 of byte 3)
-            lb = bool(buffer[3] & 0x40) # Low bit (bit 6 of byte 3)
-            sn = (sn, hb, lb)
+            sn = cls._unpack_ascii_4b5c(bytes(buffer[:4]))
         elif fmt == cls.HEX_5B6C:
             if len(buffer) < 5:
                 raise ValueError
-            sn  = "{:X}".format(buffer[0] & 0xF)
-            sn += "{:X}".format(buffer[1] & 0xF)
-            sn += "{:X}".format(buffer[2] & 0xF)
-            sn += "{:X}".format(buffer[3] & 0xF)
-            sn += "{:X}".format(buffer[4] & 0xF)
-            sn += "{:X}".format(buffer[3] >> 4)
+            sn = cls._unpack_hex_5b6c(bytes(buffer[:5]))
         else:
             raise ValueError
         return sn
@@ -40,36 +37,80 @@ class SerialNumberFormat:
     @classmethod
     def pack(cls, fmt, s: str, hb: bool=False, lb: bool=False) -> bytes:
         if fmt == cls.ASCII_4B5C:
-            b = []
-            for i in range(5):
-                if i < len(s):
-                    b.append(ord(s[i]) - 0x30)
-                else:
-                    b.append(0x3F) # Blank
-            buffer  = bytes([((b[1] & 0x0F) << 4) | (b[0] & 0xF)])
-            buffer += bytes([((b[3] & 0x0F) << 4) | (b[2] & 0xF)])
-            buffer += bytes([((b[1] & 0x30) << 2) | ((b[0] & 0x30) << 0) | (b[4] & 0x0F)])
-            buffer += bytes([(int(hb) << 7 ) | (int(lb) << 6) | ((b[4] & 0x30) << 0) | ((b[3] & 0x30) >> 2) | ((b[2] & 0x30) >> 4)])
+            buffer = cls._pack_ascii_4b5c(s, hb, lb)
         elif fmt == cls.HEX_5B6C:
-            buffer  = bytes([int(s[0], 16)])
-            buffer += bytes([int(s[1], 16)])
-            buffer += bytes([int(s[2], 16)])
-            buffer += bytes([(int(s[5], 16) << 4) + int(s[3], 16)])
-            buffer += bytes([int(s[4], 16)])
+            buffer = cls._pack_hex_5b6c(s)
         else:
             raise ValueError
         return buffer
 
+    # Serial numbers seen on a given system are few, so results are memoized
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _unpack_ascii_4b5c(buffer: bytes) -> tuple:
+        sn = bytes([
+            0x30 + (((buffer[2] >> 0) & 0x30) | (buffer[0] & 0xF)),
+            0x30 + (((buffer[2] >> 2) & 0x30) | (buffer[0] >> 4)),
+            0x30 + (((buffer[3] << 4) & 0x30) | (buffer[1] & 0xF)),
+            0x30 + (((buffer[3] << 2) & 0x30) | (buffer[1] >> 4)),
+            0x30 + (((buffer[3] << 0) & 0x30) | (buffer[2] & 0xF))
+        ]).decode('ascii').partition('o')[0] # 'o' (0x3F + 0x30) is a blank and ends the serial number
+        hb = True if buffer[3] & 0x80 else False # High bit (bit 7 of byte 3)
+        lb = True if buffer[3] & 0x40 else False # Low bit (bit 6 of byte 3)
+        return (sn, hb, lb)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _unpack_hex_5b6c(buffer: bytes) -> str:
+        return _HEX_LO[buffer[0]] + _HEX_LO[buffer[1]] + _HEX_LO[buffer[2]] + _HEX_LO[buffer[3]] + _HEX_LO[buffer[4]] + _HEX_HI[buffer[3]]
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _pack_ascii_4b5c(s: str, hb: bool, lb: bool) -> bytes:
+        b = s[:5].ljust(5, 'o').encode('ascii') # 'o' (0x3F + 0x30) pads with blanks
+        b = (b[0] - 0x30, b[1] - 0x30, b[2] - 0x30, b[3] - 0x30, b[4] - 0x30)
+        return bytes([
+            ((b[1] & 0x0F) << 4) | (b[0] & 0xF),
+            ((b[3] & 0x0F) << 4) | (b[2] & 0xF),
+            ((b[1] & 0x30) << 2) | ((b[0] & 0x30) << 0) | (b[4] & 0x0F),
+            (int(hb) << 7 ) | (int(lb) << 6) | ((b[4] & 0x30) << 0) | ((b[3] & 0x30) >> 2) | ((b[2] & 0x30) >> 4)
+        ])
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _pack_hex_5b6c(s: str) -> bytes:
+        buffer  = bytes([int(s[0], 16)])
+        buffer += bytes([int(s[1], 16)])
+        buffer += bytes([int(s[2], 16)])
+        buffer += bytes([(int(s[5], 16) << 4) + int(s[3], 16)])
+        buffer += bytes([int(s[4], 16)])
+        return buffer
+
 
 class InvalidMessageBytesError(ValueError):
     pass
 
 
+class UnimplementedMessageError(InvalidMessageBytesError):
+
+    # Raised on every unmatched branch of the subclass search, so the message is only formatted when displayed
+    def __init__(self, cls: type, msg: 'Message'):
+        super().__init__(cls, msg)
+
+    def __str__(self):
+        (cls, msg) = self.args
+        return "Unimplemented " + cls.__name__ + ":\nRaw: " + bytes(msg).hex().upper() + "\n" + str(msg)
+
+
 # Level 1
 class Message:
 
+    DECODED = {} # Message (or ValueError) by received bytes, so repeated transmissions skip the subclass search
+    DISPATCH = None # Attributes that direct subclasses' factories require to match their own, if any; subclasses without them are tried for any value
     PAYLOAD_LENGTHS = {0x00: 7, 0x11: 2, 0x22: 3, 0x33: 4, 0x66: 7}
     VENDOR_CODE = 0xCC05 # Could be part of RF protocol preamble
+    _subclasses = [] # Direct subclasses in definition order, registered by __init_subclass__
 
     def __init__(self, plc: int, sn: str, payload: bytes, footer: bytes):
         if len(sn) != 5:
@@ -78,11 +119,32 @@ class Message:
         self.sn = sn
         self.payload = payload
         self.footer = footer
+        self.checksum = sum(payload) & 0xFF
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._subclasses = []
+        for base in cls.__bases__:
+            if issubclass(base, Message):
+                base._subclasses.append(cls)
+        if cls.__dict__.get('DISPATCH'):
+            cls._dispatch = {} # Direct subclasses by DISPATCH values, in definition order
+            cls._dispatch_any = [] # Direct subclasses without DISPATCH values, also in every list above
+            cls._dispatch_key = attrgetter(*cls.DISPATCH)
+        for base in cls.__bases__:
+            if base.__dict__.get('DISPATCH'):
+                try:
+                    key = base._dispatch_key(cls)
+                except AttributeError:
+                    base._dispatch_any.append(cls)
+                    for candidates in base._dispatch.values():
+                        candidates.append(cls)
+                else:
+                    base._dispatch.setdefault(key, list(base._dispatch_any)).append(cls)
 
     def __bytes__(self):
-        sn = self.sn.encode('ascii')
-        pl = Message.PAYLOAD_LENGTHS.get(self.plc)
-        return struct.pack(">HB5B", self.VENDOR_CODE, self.plc, *sn) + self.payload + struct.pack(">B", self.checksum) + self.footer
+        payload = self.payload
+        return _FRAMES[len(payload)].pack(self.VENDOR_CODE, self.plc, self.sn.encode('ascii'), payload, self.checksum) + self.footer
 
     def __str__(self):
         s = "Payload Length Code: 0x{:02X} ({} bytes)\n".format(self.plc, self.PAYLOAD_LENGTHS.get(self.plc))
@@ -90,20 +152,29 @@ class Message:
         s += "Checksum: 0x{:02X}\n".format(self.checksum)
         return s
 
-    @property
-    def checksum(self) -> int:
-        return sum(self.payload) % 256
-
-    @checksum.setter
-    def checksum(self, value) -> None:
-        if value != self.checksum:
-            raise ValueError("Checksum mismatch! Received: 0x{:02X}, Calculated: 0x{:02X}".format(value, self.checksum))
-
     @classmethod
     def factory(cls, b: bytes, recurse: bool=True) -> 'Message':
+        if not recurse:
+            return cls._factory(b, recurse)
+        b = bytes(b)
+        msg = cls.DECODED.get(b) # Held in a local, as another receive thread may clear the cache
+        if msg is None:
+            try:
+                msg = cls._factory(b)
+            except ValueError as e:
+                msg = e
+            if len(cls.DECODED) >= 1024:
+                cls.DECODED.clear()
+            cls.DECODED[b] = msg
+        if isinstance(msg, ValueError):
+            raise type(msg)(*msg.args)
+        return copy(msg)
+
+    @classmethod
+    def _factory(cls, b: bytes, recurse: bool=True) -> 'Message':
         if len(b) < 11:
             raise InvalidMessageBytesError("Message must be at least 11 bytes") # Consider removing or moving down to children
-        vc = struct.unpack(">H", b[0:2])[0]
+        vc = _UINT16.unpack_from(b)[0]
         if vc != Message.VENDOR_CODE:
             raise InvalidMessageBytesError("Invalid Vendor Code: 0x{:04X}".format(vc))
         plc = b[2]
@@ -114,23 +185,32 @@ class Message:
         except UnicodeDecodeError:
             raise InvalidMessageBytesError("Invalid serial number with raw bytes: " + ", ".join(map("0x{:02X}".format, b[3:8])))
         pl = cls.PAYLOAD_LENGTHS[plc]
+        if len(b) < 8 + pl + 1:
+            raise InvalidMessageBytesError("Message too short for payload length code: 0x{:02X}".format(plc))
         payload = b[8 : 8 + pl]
         footer = b[8 + pl + 1 :]
         msg = cls(plc, sn, payload, footer)
+        checksum = b[8 + pl]
+        if checksum != msg.checksum: # Reject corrupt frames before searching subclasses
+            raise ValueError("Checksum mismatch! Received: 0x{:02X}, Calculated: 0x{:02X}".format(checksum, msg.checksum))
         if recurse:
             msg = cls.from_parent(msg, recurse)
-        checksum = b[8 + pl]
-        msg.checksum = checksum # Validate checksum
+            if checksum != msg.checksum: # The subclass must re-encode the same payload
+                raise ValueError("Checksum mismatch! Received: 0x{:02X}, Calculated: 0x{:02X}".format(checksum, msg.checksum))
         return msg
 
     @classmethod
     def from_parent(cls, msg: 'Message', recurse=True): # Returns subclass of Message
-        for c in cls.__subclasses__():
+        if cls.__dict__.get('DISPATCH'):
+            candidates = cls._dispatch.get(cls._dispatch_key(msg), cls._dispatch_any)
+        else:
+            candidates = cls._subclasses
+        for c in candidates:
             try:
                 return c.factory(msg, recurse)
             except ValueError:
                 pass
-        raise InvalidMessageBytesError("Unimplemented " + cls.__name__ + ":\nRaw: " + "".join(map("{:02X}".format, bytes(msg))) + "\n" + str(msg))
+        raise UnimplementedMessageError(cls, msg)
 
 
 # Level 2
@@ -203,11 +283,13 @@ class KeypadMessage(ComponentMessage):
         ADD_FREEZE_SENSOR_MENU_REQUEST = 0x79
         ADD_WATER_SENSOR_MENU_REQUEST = 0x7A
 
-    def __init__(self, plc: int, sn: str, sequence: int, event_type: 'KeypadMessage.EventType', payload_body: bytes):
+    def __init__(self, plc: int, sn: str, sequence: int, event_type: 'KeypadMessage.EventType', payload_body: bytes, from_properties: bool=False):
         self.sequence = sequence
         self.event_type = event_type
-        self.payload_body = payload_body
-        super().__init__(plc, sn, self.payload, self.footer)
+        if not from_properties: # Otherwise payload_body was read from this instance, so storing it back through the setter is redundant
+            self.payload_body = payload_body
+        payload = _UINT8_PAIR.pack(self.origin_type, (sequence << 4) | 0x4) + payload_body + _BYTES[event_type]
+        super().__init__(plc, sn, payload, self.footer)
 
     def __str__(self):
         s = super().__str__()
@@ -218,8 +300,7 @@ class KeypadMessage(ComponentMessage):
 
     @classmethod
     def factory(cls, msg: ComponentMessage, recurse: bool=True) -> 'KeypadMessage':
-        origin_type = DeviceType(msg.payload[0])
-        if origin_type != cls.origin_type:
+        if msg.payload[0] != cls.origin_type:
             raise InvalidMessageBytesError
         if len(msg.payload) < 3:
             raise InvalidMessageBytesError
@@ -231,15 +312,6 @@ class KeypadMessage(ComponentMessage):
             msg = cls.from_parent(msg)
         return msg
 
-    @property
-    def payload(self) -> bytes:
-        return bytes([self.origin_type, (self.sequence << 4) | 0x4]) + self.payload_body + bytes([self.event_type])
-
-    @payload.setter
-    def payload(self, value) -> None:
-        if value != self.payload:
-            raise ValueError
-
 
 # This is a status message? (KE = 0x31)
 #class KeypadOutOfRangeMessage(KeypadEventMessage):
@@ -260,7 +332,7 @@ class KeypadRemoveComponentScrollMenuRequest(KeypadMessage):
 
     def __init__(self, sn: str, sequence, n: int):
         self.n = n # TODO: Check range
-        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -282,7 +354,7 @@ class KeypadRemoveComponentScrollMenuRequest(KeypadMessage):
 
     @payload_body.setter
     def payload_body(self, value) -> None:
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
@@ -293,7 +365,7 @@ class KeypadPinMessage(KeypadMessage):
 
     def __init__(self, sn: str, sequence, event_type: 'KeypadMessage.EventType', pin):
         self.pin = Validator.pin(pin)
-        super().__init__(self.plc, sn, sequence, event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, event_type, self.payload_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -306,10 +378,7 @@ class KeypadPinMessage(KeypadMessage):
             raise InvalidMessageBytesError
         if msg.payload_body[2:4] != cls.payload_body_suffix:
             raise InvalidMessageBytesError
-        pin = str(msg.payload_body[0] & 0xF)
-        pin += str(msg.payload_body[0] >> 4)
-        pin += str(msg.payload_body[1] & 0xF)
-        pin += str(msg.payload_body[1] >> 4)
+        pin = _PIN_DIGITS[msg.payload_body[0]] + _PIN_DIGITS[msg.payload_body[1]]
         msg = cls(msg.sn, msg.sequence, msg.event_type, pin)
         if recurse:
             msg = cls.from_parent(msg)
@@ -317,12 +386,12 @@ class KeypadPinMessage(KeypadMessage):
 
     @property
     def payload_body(self) -> bytes:
-        stuffed_pin = bytes([(int(self.pin[1]) << 4) + int(self.pin[0]), (int(self.pin[3]) << 4) + int(self.pin[2])])
+        stuffed_pin = _UINT8_PAIR.pack(_PIN_BYTES[self.pin[0:2]], _PIN_BYTES[self.pin[2:4]])
         return stuffed_pin + self.payload_body_suffix
 
     @payload_body.setter
     def payload_body(self, value) -> None:
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 # Level 5
@@ -374,7 +443,7 @@ class KeypadSimpleRequest(KeypadMessage):
     plc = 0x22
 
     def __init__(self, sn: str, sequence: int, event_type: KeypadMessage.EventType):
-        super().__init__(self.plc, sn, sequence, event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, event_type, self.payload_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: KeypadMessage, recurse: bool=True) -> 'KeypadSimpleRequest':
@@ -388,241 +457,107 @@ class KeypadSimpleRequest(KeypadMessage):
         return msg
 
 
-# Level 5
-class KeypadExtendedStatusRequest(KeypadSimpleRequest):
-
-    event_type = KeypadMessage.EventType.EXTENDED_STATUS_REQUEST
+class KeypadSimpleEventTrait: # __init__ and factory for subclasses that fix event_type
 
     def __init__(self, sn: str, sequence: int):
         super().__init__(sn, sequence, self.event_type)
 
     @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadExtendedStatusRequest':
+    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> KeypadSimpleRequest:
         if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
+            raise InvalidMessageBytesError
         return cls(msg.sn, msg.sequence)
 
 
-class KeypadTestModeOnRequest(KeypadSimpleRequest):
-
-    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
+# Level 5
+class KeypadExtendedStatusRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
+    event_type = KeypadMessage.EventType.EXTENDED_STATUS_REQUEST
 
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadTestModeOnRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
 
+class KeypadTestModeOnRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
-class KeypadTestModeOffRequest(KeypadSimpleRequest):
+    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
 
-    event_type = KeypadMessage.EventType.TEST_MODE_OFF_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
+class KeypadTestModeOffRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadTestModeOffRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
+    event_type = KeypadMessage.EventType.TEST_MODE_OFF_REQUEST
 
 
-class KeypadRemoveComponentMenuRequest(KeypadSimpleRequest):
+class KeypadRemoveComponentMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.REMOVE_COMPONENT_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadRemoveComponentMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadHomeRequest(KeypadSimpleRequest):
+class KeypadHomeRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.HOME_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadHomeRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadPanicRequest(KeypadSimpleRequest):
+class KeypadPanicRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.PANIC_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadPanicRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadAwayRequest(KeypadSimpleRequest):
+class KeypadAwayRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.AWAY_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadAwayRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadOffRequest(KeypadSimpleRequest):
+class KeypadOffRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.OFF_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadOffRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
-class KeypadEnterMenuRequest(KeypadSimpleRequest):
+class KeypadEnterMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.ENTER_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadEnterMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadExitMenuRequest(KeypadSimpleRequest):
+class KeypadExitMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.EXIT_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadExitMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadChangePinMenuRequest(KeypadSimpleRequest):
+class KeypadChangePinMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.CHANGE_PIN_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadChangePinMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadChangePinConfirmMenuRequest(KeypadSimpleRequest):
+class KeypadChangePinConfirmMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.CHANGE_PIN_CONFIRM_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadChangePinConfirmMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadChangePrefixMenuRequest(KeypadSimpleRequest):
+class KeypadChangePrefixMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.CHANGE_PREFIX_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadChangePrefixMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadAddComponentMenuRequest(KeypadSimpleRequest):
+class KeypadAddComponentMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.ADD_COMPONENT_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadAddComponentMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadRemoveComponentSelectMenuRequest(KeypadSimpleRequest):
+class KeypadRemoveComponentSelectMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.REMOVE_COMPONENT_SELECT_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadRemoveComponentSelectMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
-class KeypadAddComponentLastTypeMenuRequest(KeypadSimpleRequest):
+class KeypadAddComponentLastTypeMenuRequest(KeypadSimpleEventTrait, KeypadSimpleRequest):
 
     event_type = KeypadMessage.EventType.ADD_COMPONENT_LAST_TYPE_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int):
-        super().__init__(sn, sequence, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadSimpleRequest, recurse: bool=True) -> 'KeypadAddComponentLasTypeMenuRequest':
-        if msg.event_type != cls.event_type:
-             raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence)
-
 
 # Level 4
 class KeypadPrefixRequest(KeypadMessage):
 
     event_type = KeypadMessage.EventType.NEW_PREFIX_REQUEST
-    payload_body_prefix = "F"
-    payload_body_suffix = "FFCFFF"
     plc = 0x66
 
     def __init__(self, sn: str, sequence: int, prefix):
         self.prefix = Validator.prefix(prefix)
-        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -640,16 +575,14 @@ class KeypadPrefixRequest(KeypadMessage):
             raise InvalidMessageBytesError
         if msg.event_type != cls.event_type:
             raise InvalidMessageBytesError
-        payload_body_prefix = "{:X}".format(msg.payload_body[0] >> 4)
-        if payload_body_prefix != cls.payload_body_prefix:
-            raise InvalidMessageBytesError
-        payload_body_suffix = "{:02X}".format(msg.payload_body[1])
-        if payload_body_suffix != cls.payload_body_suffix:
-            raise InvalidMessageBytesError
-        prefix = msg.payload_body[0] & 0xF
-        if prefix == 0xF:
+        payload_body = _UINT32.unpack(msg.payload_body)[0]
+        if payload_body == 0xFFFFFFFF:
             prefix = None
-        elif prefix > 9:
+        elif payload_body | 0x0F000000 == 0xFFFFCFFF: # 0xF, prefix digit, 0xFFCFFF
+            prefix = payload_body >> 24 & 0xF
+            if prefix > 9:
+                raise InvalidMessageBytesError
+        else:
             raise InvalidMessageBytesError
         return cls(msg.sn, msg.sequence, prefix)
 
@@ -658,12 +591,12 @@ class KeypadPrefixRequest(KeypadMessage):
         if self.prefix is None:
             prefix = 0xFFFFFFFF
         else:
-            prefix = int(self.payload_body_prefix + str(self.prefix) + payload_body_suffix, 16)
-        return struct.pack(">I", prefix)
+            prefix = 0xF0FFCFFF | (self.prefix << 24) # 0xF, prefix digit, 0xFFCFFF
+        return _UINT32.pack(prefix)
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
@@ -674,7 +607,7 @@ class KeypadModifyComponentMenuRequest(KeypadMessage):
     def __init__(self, sn: str, sequence: int, c_sn: str, event_type: KeypadMessage.EventType):
         # Verify if Component Type is sent
         self.c_sn = c_sn
-        super().__init__(self.plc, sn, sequence, event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, event_type, self.payload_body, from_properties=True)
 
     def __str__(self):
         r = super().__str__()
@@ -700,149 +633,72 @@ class KeypadModifyComponentMenuRequest(KeypadMessage):
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
-# Level 5
-class KeypadRemoveComponentConfirmMenuRequest(KeypadModifyComponentMenuRequest):
 
-    event_type = KeypadMessage.EventType.REMOVE_COMPONENT_CONFIRM_MENU_REQUEST
+class KeypadModifyComponentEventTrait:
 
     def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
+        super().__init__(sn, sequence, c_sn, self.event_type)
 
     @classmethod
     def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
         if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
+            raise InvalidMessageBytesError
         return cls(msg.sn, msg.sequence, msg.c_sn)
 
 
-class KeypadAddEntrySensorMenuRequest(KeypadModifyComponentMenuRequest):
-
-    event_type = KeypadMessage.EventType.ADD_ENTRY_SENSOR_MENU_REQUEST
+# Level 5
+class KeypadRemoveComponentConfirmMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
+    event_type = KeypadMessage.EventType.REMOVE_COMPONENT_CONFIRM_MENU_REQUEST
 
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
 
+class KeypadAddEntrySensorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
-class KeypadAddMotionSensorMenuRequest(KeypadModifyComponentMenuRequest):
+    event_type = KeypadMessage.EventType.ADD_ENTRY_SENSOR_MENU_REQUEST
 
-    event_type = KeypadMessage.EventType.ADD_MOTION_SENSOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
+class KeypadAddMotionSensorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
+    event_type = KeypadMessage.EventType.ADD_MOTION_SENSOR_MENU_REQUEST
 
 
-class KeypadAddPanicButtonMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddPanicButtonMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_PANIC_BUTTON_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
-class KeypadAddKeychainRemoteMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddKeychainRemoteMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_KEYCHAIN_REMOTE_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
-class KeypadAddGlassbreakSensorMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddGlassbreakSensorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_GLASSBREAK_SENSOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
-class KeypadAddSmokeDetectorMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddSmokeDetectorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_SMOKE_DETECTOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
-class KeypadAddCoDetectorMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddCoDetectorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_CO_DETECTOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
-class KeypadAddFreezeSensorMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddFreezeSensorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_FREEZE_SENSOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
 
-
-class KeypadAddWaterSensorMenuRequest(KeypadModifyComponentMenuRequest):
+class KeypadAddWaterSensorMenuRequest(KeypadModifyComponentEventTrait, KeypadModifyComponentMenuRequest):
 
     event_type = KeypadMessage.EventType.ADD_WATER_SENSOR_MENU_REQUEST
 
-    def __init__(self, sn: str, sequence: int, c_sn: str):
-        super().__init__(str, sequence, c_sn, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: KeypadModifyComponentMenuRequest, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            return InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.c_sn)
-
 
 # Level 4
 class KeypadAddComponentTypeMenuRequest(KeypadMessage):
@@ -864,7 +720,7 @@ class KeypadAddComponentTypeMenuRequest(KeypadMessage):
 
     def __init__(self, sn: str, sequence, c_type: 'KeypadAddComponentTypeMenuRequest.ComponentType'):
         self.c_type = c_type
-        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body)
+        super().__init__(self.plc, sn, sequence, self.event_type, self.payload_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -882,16 +738,17 @@ class KeypadAddComponentTypeMenuRequest(KeypadMessage):
 
     @property
     def payload_body(self):
-        return bytes([self.c_type])
+        return _BYTES[self.c_type]
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 # Level 2
 class BaseStationKeypadMessage(Message):
 
+    DISPATCH = ('plc', 'msg_type', 'info_type', 'event_type')
     origin_type = DeviceType.BASE_STATION
 
     class MessageType(UniqueIntEnum):
@@ -902,14 +759,18 @@ class BaseStationKeypadMessage(Message):
         STATUS = 0x2
         MENU = 0x6
 
-    def __init__(self, plc: int, kp_sn: str, sequence: int, msg_type: 'BaseStationKeypadMessage.MessageType', info_type: 'BaseStationKeypadMessage.InfoType', event_type: 'KeypadMessage.EventType', payload_body: bytes, footer_body: bytes):
+    def __init__(self, plc: int, kp_sn: str, sequence: int, msg_type: 'BaseStationKeypadMessage.MessageType', info_type: 'BaseStationKeypadMessage.InfoType', event_type: 'KeypadMessage.EventType', payload_body: bytes, footer_body: bytes, from_properties: bool=False):
         self.sequence = sequence
         self.msg_type = msg_type
         self.info_type = info_type
         self.event_type = event_type
-        self.payload_body = payload_body
-        self.footer_body = footer_body
-        super().__init__(plc, kp_sn, self.payload, self.footer)
+        if not from_properties: # Otherwise both bodies were read from this instance, so storing them back through the setters is redundant
+            self.payload_body = payload_body
+            self.footer_body = footer_body
+        self._discriminant = (plc << 24) | (msg_type << 16) | (info_type << 8) | event_type # Same packing as _DISCRIMINANT, with _HEADER in the top three bytes
+        payload = _UINT8_PAIR.pack(self.origin_type, msg_type) + payload_body + _BYTES[event_type]
+        footer = footer_body + _BYTES[(sequence << 4) | info_type]
+        super().__init__(plc, kp_sn, payload, footer)
 
     def __str__(self):
         s = super().__str__()
@@ -921,10 +782,21 @@ class BaseStationKeypadMessage(Message):
         s += "Footer Serial Number: " + SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, self.footer_body) + "\n"
         return s
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        try:
+            cls._HEADER = (cls.plc << 16) | (cls.msg_type << 8) | cls.info_type
+            cls._DISCRIMINANT = (cls._HEADER << 8) | cls.event_type
+        except AttributeError:
+            pass # Not fixed by this class, so its factory checks the fields separately
+
+    @cached_property
+    def bs_sn(self): # Parsed once, then shared by every subclass factory tried on this message
+        return SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, self.footer_body)
+
     @classmethod
     def factory(cls, msg: Message, recurse: bool=True):
-        origin_type = DeviceType(msg.payload[0])
-        if origin_type != cls.origin_type:
+        if msg.payload[0] != cls.origin_type:
             raise InvalidMessageBytesError
         msg_type = cls.MessageType(msg.payload[1])
         payload_body = msg.payload[2:-1]
@@ -937,24 +809,6 @@ class BaseStationKeypadMessage(Message):
             msg = cls.from_parent(msg)
         return msg
 
-    @property
-    def footer(self):
-        return self.footer_body + bytes([(self.sequence << 4) | self.info_type])
-
-    @footer.setter
-    def footer(self, value):
-        if value != self.footer:
-            raise ValueError
-
-    @property
-    def payload(self):
-        return bytes([self.origin_type, self.msg_type]) + self.payload_body + bytes([self.event_type])
-
-    @payload.setter
-    def payload(self, value):
-        if value != self.payload:
-            raise ValueError
-
 
 # Level 3
 class BaseStationKeypadResponseTrait:
@@ -977,13 +831,15 @@ class BaseStationKeypadStatusMessageTrait:
         UNKNOWN = 2 # TODO
         NO_LINK_TO_DISPATCHER = 3
 
+    ERROR_FLAG_NAMES = tuple((1 << i, i.__class__.key(i)) for i in ErrorFlags) # (mask, name) pairs, in __str__ order
+
     @property
     def footer_body(self):
         return SerialNumberFormat.pack(SerialNumberFormat.HEX_5B6C, self.bs_sn)
 
     @footer_body.setter
     def footer_body(self, value):
-        if value != self.footer_body:
+        if __debug__ and value != self.footer_body:
             raise ValueError
 
 
@@ -995,6 +851,8 @@ class BaseStationKeypadMenuMessageTrait:
 
 class BaseStationKeypadExtendedStatusMessage(BaseStationKeypadMessage, BaseStationKeypadStatusMessageTrait):
 
+    DISPATCH = ('msg_type', 'event_type')
+
     class EntrySensorStatusType(UniqueIntEnum):
         ALARM_KEYPAD = 0x10
         ALARM_KEYCHAIN_REMOTE = 0x20
@@ -1009,18 +867,13 @@ class BaseStationKeypadExtendedStatusMessage(BaseStationKeypadMessage, BaseStati
         self.ess = ess
         self.tl = tl
         self.pb3lsn = pb3lsn # TODO: Payload Body, Byte 3, LSN; meaning of 0x0 and 0xC
-        super().__init__(0x66, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        self._payload_body = _UINT8_QUAD.pack((flags << 4) | armed, ess, tl >> 4, ((tl & 0xF) << 4) | pb3lsn)
+        super().__init__(0x66, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
         s += "Error Flags: \n"
-        for i in BaseStationKeypadStatusMessageTrait.ErrorFlags:
-            s += "\t" + i.__class__.key(i) + ": "
-            if self.flags & (1 << i):
-                s += "Y"
-            else:
-                s += "N"
-            s += "\n"
+        s += "".join("\t" + name + (": Y\n" if self.flags & mask else ": N\n") for (mask, name) in self.ERROR_FLAG_NAMES)
         s += "Armed State: " + self.armed.__class__.key(self.armed) + "\n"
         s += "Entry Sensor Status: " + self.ess.__class__.key(self.ess) + "\n"
         s += "Countdown Timer: " + str(self.tl) + " seconds\n"
@@ -1033,12 +886,13 @@ class BaseStationKeypadExtendedStatusMessage(BaseStationKeypadMessage, BaseStati
             raise InvalidMessageBytesError
         if msg.info_type != cls.info_type:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
-        flags = msg.payload_body[0] >> 4
-        armed = ArmedState(msg.payload_body[0] & 0xF)
-        ess = cls.EntrySensorStatusType(msg.payload_body[1])
-        tl = (msg.payload_body[2] << 4) | (msg.payload_body[3] >> 4)
-        pb3lsn = msg.payload_body[3] & 0xF
+        bs_sn = msg.bs_sn
+        (pb0, pb1, pb2, pb3) = _UINT8_QUAD.unpack(msg.payload_body)
+        flags = pb0 >> 4
+        armed = ArmedState(pb0 & 0xF)
+        ess = cls.EntrySensorStatusType(pb1)
+        tl = (pb2 << 4) | (pb3 >> 4)
+        pb3lsn = pb3 & 0xF
         msg = cls(msg.sn, msg.sequence, bs_sn, msg.msg_type, msg.event_type, flags, armed, ess, tl, pb3lsn)
         if recurse:
             msg = cls.from_parent(msg)
@@ -1046,20 +900,14 @@ class BaseStationKeypadExtendedStatusMessage(BaseStationKeypadMessage, BaseStati
 
     @property
     def payload_body(self):
-        payload_body = bytes([(self.flags << 4) | self.armed])
-        payload_body += bytes([self.ess])
-        payload_body += bytes([self.tl >> 4, ((self.tl & 0xF) << 4) | self.pb3lsn])
-        return payload_body
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
-# Level 4
-class BaseStationKeypadExtendedStatusResponse(BaseStationKeypadExtendedStatusMessage, BaseStationKeypadResponseTrait):
-
-    event_type = KeypadMessage.EventType.EXTENDED_STATUS_REQUEST
+class BaseStationKeypadExtendedStatusEventTrait: # Also fixes msg_type
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, flags: int, armed: ArmedState, ess: BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType, tl: int, pb3lsn: int):
         super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type, flags, armed, ess, tl, pb3lsn)
@@ -1073,103 +921,67 @@ class BaseStationKeypadExtendedStatusResponse(BaseStationKeypadExtendedStatusMes
         return cls(msg.sn, msg.sequence, msg.bs_sn, msg.flags, msg.armed, msg.ess, msg.tl, msg.pb3lsn)
 
 
-class BaseStationKeypadPowerOnUpdate(BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
+# Level 4
+class BaseStationKeypadExtendedStatusResponse(BaseStationKeypadExtendedStatusEventTrait, BaseStationKeypadExtendedStatusMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.EXTENDED_STATUS_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str, flags: int, armed: ArmedState, ess: BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType, tl: int, pb3lsn: int):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type, flags, armed, ess, tl, pb3lsn)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadExtendedStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.bs_sn, msg.flags, msg.armed, msg.ess, msg.tl, msg.pb3lsn)
+class BaseStationKeypadPowerOnUpdate(BaseStationKeypadExtendedStatusEventTrait, BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
+
+    event_type = KeypadMessage.EventType.EXTENDED_STATUS_REQUEST
 
 
-class BaseStationKeypadExtendedStatusUpdate(BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadExtendedStatusUpdate(BaseStationKeypadExtendedStatusEventTrait, BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.EXTENDED_STATUS_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str, flags: int, armed: ArmedState, ess: BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType, tl: int, pb3lsn: int):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type, flags, armed, ess, tl, pb3lsn)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadExtendedStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.bs_sn, msg.flags, msg.armed, msg.ess, msg.tl, msg.pb3lsn)
 
-
-class BaseStationKeypadExtendedStatusRemoteUpdate(BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadExtendedStatusRemoteUpdate(BaseStationKeypadExtendedStatusEventTrait, BaseStationKeypadExtendedStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.EXTENDED_STATUS_REMOTE_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str, flags: int, armed: ArmedState, ess: BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType, tl: int, pb3lsn: int):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type, flags, armed, ess, tl, pb3lsn)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadExtendedStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.bs_sn, msg.flags, msg.armed, msg.ess, msg.tl, msg.pb3lsn)
-
 
 # Level 3
 class BaseStationKeypadStatusUpdate(BaseStationKeypadMessage, BaseStationKeypadUpdateTrait, BaseStationKeypadStatusMessageTrait):
 
     event_type = KeypadMessage.EventType.STATUS_UPDATE
+    plc = 0x33
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, flags: int):
         self.bs_sn = bs_sn
         self.flags = flags
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        self._payload_body = bytes([flags])
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
         s += "Error Flags: \n"
-        for i in BaseStationKeypadStatusMessageTrait.ErrorFlags:
-            s += "\t" + i.__class__.key(i) + ": "
-            if self.flags & (1 << i):
-                s += "Y"
-            else:
-                s += "N"
-            s += "\n"
+        s += "".join("\t" + name + (": Y\n" if self.flags & mask else ": N\n") for (mask, name) in self.ERROR_FLAG_NAMES)
         return s
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != 0x33:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         flags = msg.payload_body[0]
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn, flags)
 
     @property
     def payload_body(self):
-        return bytes([self.flags])
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
 class BaseStationKeypadAlarmPinResponse(BaseStationKeypadMessage, BaseStationKeypadResponseTrait, BaseStationKeypadStatusMessageTrait):
 
     event_type = KeypadMessage.EventType.ALARM_PIN_REQUEST
+    plc = 0x33
 
     class ResponseType(UniqueIntEnum):
         INVALID = 0x01
@@ -1182,25 +994,22 @@ class BaseStationKeypadAlarmPinResponse(BaseStationKeypadMessage, BaseStationKey
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, response_type: ResponseType):
         self.bs_sn = bs_sn
         self.response_type = response_type
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        self._payload_body = _BYTES[response_type]
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
-        s += "Response: " + self.response_type.__class__.key(self.response_type) + "\n"
+        s += "Response: " + self.ResponseType.key(self.response_type) + "\n"
         return s
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != 0x33:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
+        response_type = cls.ResponseType.lookup(msg.payload_body[0])
+        if response_type is None:
             raise InvalidMessageBytesError
-        if msg.event_type != msg.event_type:
-            raise InvalidMessageBytesError
-        response_type = cls.ResponseType(msg.payload_body[0])
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         msg = cls(msg.sn, msg.sequence, bs_sn, response_type)
         #if recurse:
         #    msg = cls.from_parent(msg)
@@ -1208,17 +1017,19 @@ class BaseStationKeypadAlarmPinResponse(BaseStationKeypadMessage, BaseStationKey
 
     @property
     def payload_body(self):
-        return bytes([self.response_type])
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
 class BaseStationKeypadMenuPinResponse(BaseStationKeypadMessage, BaseStationKeypadResponseTrait, BaseStationKeypadMenuMessageTrait):
 
+    DISPATCH = ('response_type',)
     event_type = KeypadMessage.EventType.MENU_PIN_REQUEST
+    plc = 0x33
 
     class ResponseType(UniqueIntEnum):
         VALID = 0x00
@@ -1226,24 +1037,21 @@ class BaseStationKeypadMenuPinResponse(BaseStationKeypadMessage, BaseStationKeyp
 
     def __init__(self, kp_sn: str, sequence: int, response_type: ResponseType):
         self.response_type = response_type
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        self._payload_body = _BYTES[response_type]
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
-        s += "Response: " + self.response_type.__class__.key(self.response_type) + "\n"
+        s += "Response: " + self.ResponseType.key(self.response_type) + "\n"
         return s
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != 0x33:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
+        response_type = cls.ResponseType.lookup(msg.payload_body[0])
+        if response_type is None:
             raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        response_type = cls.ResponseType(msg.payload_body[0])
         msg = cls(msg.sn, msg.sequence, response_type)
         if recurse:
             msg = cls.from_parent(msg)
@@ -1251,11 +1059,11 @@ class BaseStationKeypadMenuPinResponse(BaseStationKeypadMessage, BaseStationKeyp
 
     @property
     def payload_body(self):
-        return bytes([self.response_type])
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
@@ -1267,21 +1075,15 @@ class BaseStationKeypadHomeResponse(BaseStationKeypadMessage, BaseStationKeypadR
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
         self.bs_sn = bs_sn
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.payload_body != cls.payload_body:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn)
 
 
@@ -1293,21 +1095,15 @@ class BaseStationKeypadAlarmUpdate(BaseStationKeypadMessage, BaseStationKeypadUp
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
         self.bs_sn = bs_sn
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.payload_body != cls.payload_body:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn)
 
 
@@ -1319,21 +1115,15 @@ class BaseStationKeypadAwayResponse(BaseStationKeypadMessage, BaseStationKeypadR
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
         self.bs_sn = bs_sn
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != 0x33:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != msg.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.payload_body != cls.payload_body:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn)
 
 
@@ -1345,21 +1135,15 @@ class BaseStationKeypadOffRemoteUpdate(BaseStationKeypadMessage, BaseStationKeyp
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
         self.bs_sn = bs_sn
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != 0x33:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.payload_body != cls.payload_body:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn)
 
 
@@ -1370,17 +1154,11 @@ class BaseStationKeypadEnterMenuResponse(BaseStationKeypadMessage, BaseStationKe
     payload_body = bytes([0x01]) # TODO: why constant?
 
     def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(0x33, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.footer_body != cls.footer_body:
             raise InvalidMessageBytesError
@@ -1396,17 +1174,11 @@ class BaseStationKeypadNewPrefixResponse(BaseStationKeypadMessage, BaseStationKe
     plc = 0x33
 
     def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.footer_body != cls.footer_body:
             raise InvalidMessageBytesError
@@ -1422,17 +1194,11 @@ class BaseStationKeypadRemoveComponentSelectMenuResponse(BaseStationKeypadMessag
     plc = 0x33
 
     def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.footer_body != cls.footer_body:
             raise InvalidMessageBytesError
@@ -1448,17 +1214,11 @@ class BaseStationKeypadRemoveComponentConfirmMenuResponse(BaseStationKeypadMessa
     plc = 0x33
 
     def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         if msg.footer_body != cls.footer_body:
             raise InvalidMessageBytesError
@@ -1469,6 +1229,7 @@ class BaseStationKeypadRemoveComponentConfirmMenuResponse(BaseStationKeypadMessa
 
 class BaseStationKeypadAddComponentSerialMenuResponse(BaseStationKeypadMessage, BaseStationKeypadResponseTrait, BaseStationKeypadMenuMessageTrait):
 
+    DISPATCH = ('event_type',)
     plc = 0x33
 
     class ResponseType(UniqueIntEnum):
@@ -1477,24 +1238,23 @@ class BaseStationKeypadAddComponentSerialMenuResponse(BaseStationKeypadMessage,
 
     def __init__(self, kp_sn: str, sequence: int, event_type: KeypadMessage.EventType, response_type: 'BaseStationKeypadAddComponentSerialMenuResponse.ResponseType'):
         self.response_type = response_type
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        self._payload_body = _BYTES[response_type]
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
-        s += 'Response Type: ' + self.response_type.__class__.key(self.response_type) + "\n"
+        s += 'Response Type: ' + self.ResponseType.key(self.response_type) + "\n"
         return s
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
+        if msg._discriminant >> 8 != cls._HEADER:
             raise InvalidMessageBytesError
         if msg.footer_body != cls.footer_body:
             raise InvalidMessageBytesError
-        response_type = cls.ResponseType(msg.payload_body[0])
+        response_type = cls.ResponseType.lookup(msg.payload_body[0])
+        if response_type is None:
+            raise InvalidMessageBytesError
         msg = cls(msg.sn, msg.sequence, msg.event_type, response_type)
         if recurse:
             msg = cls.from_parent(msg)
@@ -1502,19 +1262,17 @@ class BaseStationKeypadAddComponentSerialMenuResponse(BaseStationKeypadMessage,
 
     @property
     def payload_body(self):
-        return bytes([self.response_type])
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
-class BaseStationKeypadAddEntrySensorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
-
-    event_type = KeypadMessage.EventType.ADD_ENTRY_SENSOR_MENU_REQUEST
+class BaseStationKeypadAddComponentSerialEventTrait:
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
+    def __init__(self, kp_sn: str, sequence: int, response_type: BaseStationKeypadAddComponentSerialMenuResponse.ResponseType):
         super().__init__(kp_sn, sequence, self.event_type, response_type)
 
     @classmethod
@@ -1524,117 +1282,50 @@ class BaseStationKeypadAddEntrySensorMenuResponse(BaseStationKeypadAddComponentS
         return cls(msg.sn, msg.sequence, msg.response_type)
 
 
-class BaseStationKeypadAddMotionSensorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
-
-    event_type = KeypadMessage.EventType.ADD_MOTION_SENSOR_MENU_REQUEST
+class BaseStationKeypadAddEntrySensorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
+    event_type = KeypadMessage.EventType.ADD_ENTRY_SENSOR_MENU_REQUEST
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
 
+class BaseStationKeypadAddMotionSensorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
-class BaseStationKeypadAddPanicButtonMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+    event_type = KeypadMessage.EventType.ADD_MOTION_SENSOR_MENU_REQUEST
 
-    event_type = KeypadMessage.EventType.ADD_PANIC_BUTTON_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
+class BaseStationKeypadAddPanicButtonMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
+    event_type = KeypadMessage.EventType.ADD_PANIC_BUTTON_MENU_REQUEST
 
 
-class BaseStationKeypadAddKeychainRemoteMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddKeychainRemoteMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_KEYCHAIN_REMOTE_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
 
-
-class BaseStationKeypadAddGlassbreakSensorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddGlassbreakSensorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_GLASSBREAK_SENSOR_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
-
 
-class BaseStationKeypadAddSmokeDetectorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddSmokeDetectorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_SMOKE_DETECTOR_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
 
-
-class BaseStationKeypadAddCoDetectorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddCoDetectorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_CO_DETECTOR_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
-
 
-class BaseStationKeypadAddFreezeSensorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddFreezeSensorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_FREEZE_SENSOR_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
 
-
-class BaseStationKeypadAddWaterSensorMenuResponse(BaseStationKeypadAddComponentSerialMenuResponse):
+class BaseStationKeypadAddWaterSensorMenuResponse(BaseStationKeypadAddComponentSerialEventTrait, BaseStationKeypadAddComponentSerialMenuResponse):
 
     event_type = KeypadMessage.EventType.ADD_WATER_SENSOR_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, response_type):
-        super().__init__(kp_sn, sequence, self.event_type, response_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadAddComponentSerialMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        return cls(msg.sn, msg.sequence, msg.response_type)
-
 
 class BaseStationKeypadSimpleMessageTrait:
 
@@ -1644,9 +1335,11 @@ class BaseStationKeypadSimpleMessageTrait:
 
 class BaseStationKeypadSimpleStatusMessage(BaseStationKeypadMessage, BaseStationKeypadSimpleMessageTrait, BaseStationKeypadStatusMessageTrait):
 
+    DISPATCH = ('msg_type', 'event_type')
+
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, msg_type, event_type: KeypadMessage.EventType):
         self.bs_sn = bs_sn
-        super().__init__(self.plc, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
@@ -1656,7 +1349,7 @@ class BaseStationKeypadSimpleStatusMessage(BaseStationKeypadMessage, BaseStation
             raise InvalidMessageBytesError
         if msg.info_type != cls.info_type:
             raise InvalidMessageBytesError
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         msg = cls(msg.sn, msg.sequence, bs_sn, msg.msg_type, msg.event_type)
         if recurse:
             msg = cls.from_parent(msg)
@@ -1665,8 +1358,10 @@ class BaseStationKeypadSimpleStatusMessage(BaseStationKeypadMessage, BaseStation
 
 class BaseStationKeypadSimpleMenuMessage(BaseStationKeypadMessage, BaseStationKeypadSimpleMessageTrait, BaseStationKeypadMenuMessageTrait):
 
+    DISPATCH = ('event_type',)
+
     def __init__(self, kp_sn: str, sequence: int, msg_type, event_type: KeypadMessage.EventType):
-        super().__init__(self.plc, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
@@ -1682,10 +1377,7 @@ class BaseStationKeypadSimpleMenuMessage(BaseStationKeypadMessage, BaseStationKe
         return msg
 
 
-#Level 4
-class BaseStationKeypadTestModeOnResponse(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
-
-    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
+class BaseStationKeypadSimpleStatusEventTrait: # Also fixes msg_type
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
         super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
@@ -1696,236 +1388,109 @@ class BaseStationKeypadTestModeOnResponse(BaseStationKeypadSimpleStatusMessage,
             raise InvalidMessageBytesError
         if msg.event_type != cls.event_type:
             raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
+        return cls(msg.sn, msg.sequence, msg.bs_sn)
 
 
-class BaseStationKeypadTestModeOnUpdate(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
-
-    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
+class BaseStationKeypadSimpleMenuEventTrait:
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
+    def __init__(self, kp_sn: str, sequence: int):
+        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
 
     @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
+    def factory(cls, msg: BaseStationKeypadSimpleMenuMessage, recurse: bool=True):
         if msg.event_type != cls.event_type:
             raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
-
+        return cls(msg.sn, msg.sequence)
 
-class BaseStationKeypadOffResponse(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
 
-    event_type = KeypadMessage.EventType.OFF_REQUEST
+#Level 4
+class BaseStationKeypadTestModeOnResponse(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
+    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
 
+class BaseStationKeypadTestModeOnUpdate(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
-class BaseStationKeypadTestModeOffResponse(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
+    event_type = KeypadMessage.EventType.TEST_MODE_ON_REQUEST
 
-    event_type = KeypadMessage.EventType.TEST_MODE_OFF_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
+class BaseStationKeypadOffResponse(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
+    event_type = KeypadMessage.EventType.OFF_REQUEST
 
 
-class BaseStationKeypadTestModeOffUpdate(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadTestModeOffResponse(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.TEST_MODE_OFF_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
 
+class BaseStationKeypadTestModeOffUpdate(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
-class BaseStationKeypadExitMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+    event_type = KeypadMessage.EventType.TEST_MODE_OFF_REQUEST
 
-    event_type = KeypadMessage.EventType.EXIT_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
+class BaseStationKeypadExitMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
+    event_type = KeypadMessage.EventType.EXIT_MENU_REQUEST
 
 
-class BaseStationKeypadChangePinMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+class BaseStationKeypadChangePinMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.CHANGE_PIN_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
-
 
-class BaseStationKeypadChangePinConfirmMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+class BaseStationKeypadChangePinConfirmMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.CHANGE_PIN_CONFIRM_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
-
-
-class BaseStationKeypadChangePrefixMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+class BaseStationKeypadChangePrefixMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.CHANGE_PREFIX_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
-
 
-class BaseStationKeypadAddComponentMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+class BaseStationKeypadAddComponentMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.ADD_COMPONENT_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
-
-
-class BaseStationKeypadAddComponentTypeMenuResponse(BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
+class BaseStationKeypadAddComponentTypeMenuResponse(BaseStationKeypadSimpleMenuEventTrait, BaseStationKeypadSimpleMenuMessage, BaseStationKeypadResponseTrait):
 
     event_type = KeypadMessage.EventType.ADD_COMPONENT_TYPE_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int):
-        super().__init__(kp_sn, sequence, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence)
-        return msg
 
-
-class BaseStationKeypadClearSensorError1Update(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadClearSensorError1Update(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.SENSOR_ERROR_1_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
-
 
-class BaseStationKeypadClearSensorError2Update(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadClearSensorError2Update(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.SENSOR_ERROR_2_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
 
-
-class BaseStationKeypadClearSensorError3Update(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadClearSensorError3Update(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.SENSOR_ERROR_3_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
-
-
-class BaseStationKeypadClearSensorError4Update(BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
+class BaseStationKeypadClearSensorError4Update(BaseStationKeypadSimpleStatusEventTrait, BaseStationKeypadSimpleStatusMessage, BaseStationKeypadUpdateTrait):
 
     event_type = KeypadMessage.EventType.SENSOR_ERROR_4_UPDATE
 
-    def __init__(self, kp_sn: str, sequence: int, bs_sn: str):
-        super().__init__(kp_sn, sequence, bs_sn, self.msg_type, self.event_type)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadSimpleStatusMessage, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.bs_sn)
-        return msg
-
 
 # Level 3
 class BaseStationKeypadRemoveComponentScrollMenuResponse(BaseStationKeypadMessage, BaseStationKeypadResponseTrait, BaseStationKeypadMenuMessageTrait):
 
+    DISPATCH = ('event_type',)
     plc = 0x66
 
     def __init__(self, kp_sn: str, sequence: int, event_type: KeypadMessage.EventType, c_sn: str, left_arrow: bool, right_arrow: bool):
         self.c_sn = c_sn
         self.left_arrow = left_arrow
         self.right_arrow = right_arrow
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        self._payload_body = SerialNumberFormat.pack(SerialNumberFormat.ASCII_4B5C, c_sn, left_arrow, right_arrow)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -1936,11 +1501,7 @@ class BaseStationKeypadRemoveComponentScrollMenuResponse(BaseStationKeypadMessag
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
+        if msg._discriminant >> 8 != cls._HEADER:
             raise InvalidMessageBytesError
         (c_sn, left_arrow, right_arrow) = SerialNumberFormat.unpack(SerialNumberFormat.ASCII_4B5C, msg.payload_body)
         msg = cls(msg.sn, msg.sequence, msg.event_type, c_sn, left_arrow, right_arrow)
@@ -1950,19 +1511,15 @@ class BaseStationKeypadRemoveComponentScrollMenuResponse(BaseStationKeypadMessag
 
     @property
     def payload_body(self):
-        payload_body = SerialNumberFormat.pack(SerialNumberFormat.ASCII_4B5C, self.c_sn, self.left_arrow, self.right_arrow)
-        return payload_body
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
-# Level 4
-class BaseStationKeypadRemoveEntrySensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
-
-    event_type = KeypadMessage.EventType.REMOVE_ENTRY_SENSOR_SCROLL_MENU_REQUEST
+class BaseStationKeypadRemoveComponentScrollEventTrait:
 
     def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
         super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
@@ -1971,144 +1528,59 @@ class BaseStationKeypadRemoveEntrySensorScrollMenuResponse(BaseStationKeypadRemo
     def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
         if msg.event_type != cls.event_type:
             raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
+        return cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
 
-class BaseStationKeypadRemoveMotionSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
 
-    event_type = KeypadMessage.EventType.REMOVE_MOTION_SENSOR_SCROLL_MENU_REQUEST
+# Level 4
+class BaseStationKeypadRemoveEntrySensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
+    event_type = KeypadMessage.EventType.REMOVE_ENTRY_SENSOR_SCROLL_MENU_REQUEST
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
 
+class BaseStationKeypadRemoveMotionSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
-class BaseStationKeypadRemovePanicButtonScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+    event_type = KeypadMessage.EventType.REMOVE_MOTION_SENSOR_SCROLL_MENU_REQUEST
 
-    event_type = KeypadMessage.EventType.REMOVE_PANIC_BUTTON_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
+class BaseStationKeypadRemovePanicButtonScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
+    event_type = KeypadMessage.EventType.REMOVE_PANIC_BUTTON_SCROLL_MENU_REQUEST
 
 
-class BaseStationKeypadRemoveKeypadScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveKeypadScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_KEYPAD_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
-
-class BaseStationKeypadRemoveKeychainRemoteScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveKeychainRemoteScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_KEYCHAIN_REMOTE_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
 
-class BaseStationKeypadRemoveGlassbreakSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveGlassbreakSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_GLASSBREAK_SENSOR_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
 
-
-class BaseStationKeypadRemoveSmokeDetectorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveSmokeDetectorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_SMOKE_DETECTOR_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
-
-class BaseStationKeypadRemoveCoDetectorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveCoDetectorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_CO_DETECTOR_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
 
-class BaseStationKeypadRemoveFreezeSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveFreezeSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_FREEZE_SENSOR_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
 
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
-
-class BaseStationKeypadRemoveWaterSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollMenuResponse):
+class BaseStationKeypadRemoveWaterSensorScrollMenuResponse(BaseStationKeypadRemoveComponentScrollEventTrait, BaseStationKeypadRemoveComponentScrollMenuResponse):
 
     event_type = KeypadMessage.EventType.REMOVE_WATER_SENSOR_SCROLL_MENU_REQUEST
 
-    def __init__(self, kp_sn: str, sequence: int, c_sn: str, left_arrow: bool, right_arrow: bool):
-        super().__init__(kp_sn, sequence, self.event_type, c_sn, left_arrow, right_arrow)
-
-    @classmethod
-    def factory(cls, msg: BaseStationKeypadRemoveComponentScrollMenuResponse, recurse: bool=True):
-        if msg.event_type != cls.event_type:
-            raise InvalidMessageBytesError
-        msg = cls(msg.sn, msg.sequence, msg.c_sn, msg.left_arrow, msg.right_arrow)
-        return msg
-
 
 class BaseStationKeypadInvalidMenuPinResponse(BaseStationKeypadMenuPinResponse):
 
@@ -2147,7 +1619,8 @@ class BaseStationKeypadEntrySensorUpdate(BaseStationKeypadMessage, BaseStationKe
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, n: int):
         self.bs_sn = bs_sn
         self.n = n
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body)
+        self._payload_body = bytes([n])
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, self.event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -2156,46 +1629,41 @@ class BaseStationKeypadEntrySensorUpdate(BaseStationKeypadMessage, BaseStationKe
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != cls.info_type:
-            raise InvalidMessageBytesError
-        if msg.event_type != cls.event_type:
+        if msg._discriminant != cls._DISCRIMINANT:
             raise InvalidMessageBytesError
         n = msg.payload_body[0]
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn, n)
 
     @property
     def payload_body(self):
-        return bytes([self.n])
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
 class BaseStationKeypadSensorErrorUpdate(BaseStationKeypadMessage, BaseStationKeypadUpdateTrait, BaseStationKeypadStatusMessageTrait):
 
+    EVENT_TYPES = dict(enumerate((
+        KeypadMessage.EventType.SENSOR_ERROR_1_UPDATE,
+        KeypadMessage.EventType.SENSOR_ERROR_2_UPDATE,
+        KeypadMessage.EventType.SENSOR_ERROR_3_UPDATE,
+        KeypadMessage.EventType.SENSOR_ERROR_4_UPDATE
+    ))) # By sensor error index n
+    NS = {event_type: n for (n, event_type) in EVENT_TYPES.items()} # By event type, for factory
     plc = 0x66
 
     def __init__(self, kp_sn: str, sequence: int, bs_sn: str, n: int, c_sn: str):
         self.bs_sn = bs_sn
         self.c_sn = c_sn
-        if n == 0:
-            event_type = KeypadMessage.EventType.SENSOR_ERROR_1_UPDATE
-        elif n == 1:
-            event_type = KeypadMessage.EventType.SENSOR_ERROR_2_UPDATE
-        elif n == 2:
-            event_type = KeypadMessage.EventType.SENSOR_ERROR_3_UPDATE
-        elif n == 3:
-            event_type = KeypadMessage.EventType.SENSOR_ERROR_4_UPDATE
-        else:
+        self._payload_body = SerialNumberFormat.pack(SerialNumberFormat.ASCII_4B5C, c_sn)
+        event_type = self.EVENT_TYPES.get(n)
+        if event_type is None:
             raise Exception("Only 4 Sensor Errors are supported.")
-        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body)
+        super().__init__(self.plc, kp_sn, sequence, self.msg_type, self.info_type, event_type, self.payload_body, self.footer_body, from_properties=True)
 
     def __str__(self):
         s = super().__str__()
@@ -2204,39 +1672,29 @@ class BaseStationKeypadSensorErrorUpdate(BaseStationKeypadMessage, BaseStationKe
 
     @classmethod
     def factory(cls, msg: BaseStationKeypadMessage, recurse: bool=True):
-        if msg.plc != cls.plc:
-            raise InvalidMessageBytesError
-        if msg.msg_type != cls.msg_type:
-            raise InvalidMessageBytesError
-        if msg.info_type != msg.info_type:
+        if msg._discriminant >> 8 != cls._HEADER:
             raise InvalidMessageBytesError
-        if msg.event_type == KeypadMessage.EventType.SENSOR_ERROR_1_UPDATE:
-            n = 0
-        elif msg.event_type == KeypadMessage.EventType.SENSOR_ERROR_2_UPDATE:
-            n = 1
-        elif msg.event_type == KeypadMessage.EventType.SENSOR_ERROR_3_UPDATE:
-            n = 2
-        elif msg.event_type == KeypadMessage.EventType.SENSOR_ERROR_4_UPDATE:
-            n = 3
-        else:
+        n = cls.NS.get(msg.event_type)
+        if n is None:
             raise InvalidMessageBytesError
         (c_sn, hb, lb) = SerialNumberFormat.unpack(SerialNumberFormat.ASCII_4B5C, msg.payload_body)
-        bs_sn = SerialNumberFormat.unpack(SerialNumberFormat.HEX_5B6C, msg.footer_body)
+        bs_sn = msg.bs_sn
         return cls(msg.sn, msg.sequence, bs_sn, n, c_sn)
 
     @property
     def payload_body(self):
-        return SerialNumberFormat.pack(SerialNumberFormat.ASCII_4B5C, self.c_sn)
+        return self._payload_body
 
     @payload_body.setter
     def payload_body(self, value):
-        if value != self.payload_body:
+        if __debug__ and value != self.payload_body:
             raise ValueError
 
 
 # Level 3
 class SensorMessage(ComponentMessage):
 
+    DISPATCH = ('origin_type',)
     footer = bytes()
     plc = 0x11
 
@@ -2247,6 +1705,7 @@ class SensorMessage(ComponentMessage):
         self.origin_type = origin_type
         self.sequence = sequence
         self.event_type = event_type
+        self._payload = bytes([(sequence << 4) + origin_type, event_type])
         super().__init__(self.plc, sn, self.payload, self.footer)
 
     def __str__(self):
@@ -2258,11 +1717,13 @@ class SensorMessage(ComponentMessage):
 
     @classmethod
     def factory(cls, msg: ComponentMessage, recurse: bool=True):
-        if msg.plc != cls.plc or len(msg.payload) != cls.PAYLOAD_LENGTHS[cls.plc]:
+        payload = msg.payload
+        if msg.plc != cls.plc or len(payload) != cls.PAYLOAD_LENGTHS[cls.plc]:
             raise InvalidMessageBytesError
-        origin_type = DeviceType(msg.payload[0] & 0xF)
-        sequence = msg.payload[0] >> 4
-        event_type = msg.payload[1]
+        stuffed_byte = payload[0]
+        origin_type = DeviceType(stuffed_byte & 0xF)
+        sequence = stuffed_byte >> 4
+        event_type = payload[1]
         msg = cls(msg.sn, origin_type, sequence, event_type)
         if recurse:
             msg = cls.from_parent(msg)
@@ -2270,12 +1731,11 @@ class SensorMessage(ComponentMessage):
 
     @property
     def payload(self):
-        stuffed_byte = (self.sequence << 4) + self.origin_type
-        return bytes([stuffed_byte, self.event_type])
+        return self._payload
 
     @payload.setter
     def payload(self, value):
-        if value != self.payload:
+        if __debug__ and value != self.payload:
             raise ValueError
 
 
@@ -3,18 +3,24 @@
 import os
 import pigpio
 from simplisafe import DeviceType
-from simplisafe.messages import Message, BaseStationKeypadMessage, ComponentMessage, KeypadMessage, SensorMessage
+from simplisafe.messages import Message, BaseStationKeypadMessage, KeypadMessage, SensorMessage
 from simplisafe.devices import AbstractTransceiver
+from select import select
 import socket
 from sys import stderr
-from threading import Thread
+from collections import deque
+from threading import Event, Thread
 from time import sleep
 
+SWAPPED_NIBBLES = bytes(((i & 0xF) << 4) | (i >> 4) for i in range(256)) # bytes.translate() table
+
 class DecodeError(Exception):
     pass
 
 class Transceiver(AbstractTransceiver):
 
+    FRAMING = {} # (SYNC periods, from base station, transmissions) by message class, filled on first send
+
     def __init__(self, *args, **kwargs):
 
         if 'rx' in kwargs:
@@ -41,9 +47,19 @@ class Transceiver(AbstractTransceiver):
             self._pi.set_mode(self.rx, pigpio.INPUT)
             self._pi.set_glitch_filter(self.rx, 400)
             #self._pi.set_noise_filter(self.rx, 400, 400)
+            self._rx_edges = deque()
+            self._rx_event = Event() # Set by the callback when edges are queued
+            self._rx_cb = self._pi.callback(self.rx, pigpio.EITHER_EDGE, self._listen_cbf)
         if self.is_transmitter:
             self._pi.set_mode(self.tx, pigpio.OUTPUT)
+            self._sync_waves = {} # Wave IDs of SYNC pulse trains, keyed by number of periods
+            mask = 1 << self.tx
+            self._pulses = {(level, d): pigpio.pulse(mask, 0, d) if level else pigpio.pulse(0, mask, d) for level in (0, 1) for d in (500, 1000, 2000)} # Shared by every wave, as wave_add_generic() only reads them
+            self._byte_pulses = [[self._pulses[n & 1, 1000 if byte >> n & 1 else 500] for n in range(8)] for byte in range(256)] # Wave pulses of each byte value, LSB first
+            self._script_writes = ("w {:d} 0 mics ".format(self.tx), "w {:d} 1 mics ".format(self.tx)) # Script pulse prefixes, indexed by level
+            self._byte_scripts = [" ".join(self._script_writes[n & 1] + ("1000" if byte >> n & 1 else "500") for n in range(8)) for byte in range(256)] # Script pulses of each byte value, LSB first
 
+        self._closed = Event()
         self._listener = Thread(target=self._listen)
         self._listener.start()
 
@@ -51,109 +67,133 @@ class Transceiver(AbstractTransceiver):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._listener.join(0)
+        self._closed.set()
+        if self.is_receiver:
+            self._rx_cb.cancel()
+            self._rx_event.set() # Wake the listener so it sees _closed
+        self._listener.join()
         self._pi.stop() # Disconnect from pigpiod
         os.close(self._read_fd)
         os.close(self._write_fd)
 
     def _listen_cbf(self, gpio, level, tick):
-        if self._rx_done:
-            return
-        if self._rx_t is None:
-            self._rx_t = tick
-            return # First edge
-        if self._rx_t > tick:
-            dt = ((tick << 32) - self._rx_t) / 1000 # Tick overflow
-        else:
-            dt = (tick - self._rx_t) / 1000 # Convert to ms
-        self._rx_t = tick
-        if dt > 2.1:
-            if self._rx_preamble_high:
-                self._rx_done = True # End of transmission
+        self._rx_edges.append((level, tick)) # Decoded in batches by the listener thread
+        if not self._rx_event.is_set():
+            self._rx_event.set()
+
+    def _demodulate(self):
+        # Runs the pulse state machine over all queued edges, up to the end of a transmission
+        edges, buffer = self._rx_edges, self._rx_buffer # State held in locals for the loop, stored back after
+        t, sync, preamble_low, preamble_high = self._rx_t, self._rx_sync_buffer, self._rx_preamble_low, self._rx_preamble_high
+        done = False
+        while edges:
+            level, tick = edges.popleft()
+            if t is None:
+                t = tick
+                continue # First edge
+            dt = (tick - t) & 0xFFFFFFFF # Microseconds (modulo 32-bit tick overflow)
+            t = tick
+            if dt <= 600: # Pulse widths ordered by frequency (data bits first)
+                bit = b'0'
+            elif 900 <= dt <= 1100:
+                bit = b'1'
+            elif dt <= 1900:
+                bit = b'X' # Invalid duration
+            elif dt <= 2100:
+                if sync == 0xF: # Check for at least 2 SYNC periods
+                    if level == 1:
+                        preamble_low = True # Valid preamble low pulse
+                        preamble_high = False
+                    elif preamble_low:
+                        preamble_high = True # Valid preamble high pulse
+                        buffer.clear() # Data follows preamble
+                else:
+                    preamble_low = False
+                continue
             else:
-                self._rx_start_flag0 = False # Malformed
-            return
-        if dt > 1.9:
-            if self._rx_sync_buffer == '1111': # Check for at least 2 SYNC periods
-                if level == 1:
-                    self._rx_preamble_low = True # Valid preamble low pulse
-                    self._rx_preamble_high = False
-                elif self._rx_preamble_low:
-                    self._rx_preamble_high = True # Valid preamble high pulse
-                    self._rx_buffer = '' # Data follows preamble
+                if preamble_high:
+                    done = True # End of transmission
+                    break
+                continue # Otherwise malformed
+            sync = ((sync << 1) | (bit == b'1')) & 0xF # Shift register of last 2 SYNC periods
+            if preamble_high:
+                buffer += bit # Append buffer
             else:
-                self._rx_preamble_low = False
-            return
-        if dt > 1.1:
-            bit = 'X' # Invalid duration
-        elif dt >= 0.9:
-            bit = '1'
-        elif dt > 0.6:
-            bit = 'X' # Invalid duration
-        else:
-            bit = '0'
-        self._rx_sync_buffer += bit # Append SYNC buffer
-        self._rx_sync_buffer = self._rx_sync_buffer[-4:] # Limit SYNC buffer to 2 periods
-        if self._rx_preamble_high:
-            self._rx_buffer += bit # Append buffer
-        else:
-            self._rx_buffer = '' # Don't append buffer if no valid preamble
+                buffer.clear() # Don't append buffer if no valid preamble
+        self._rx_t, self._rx_sync_buffer, self._rx_preamble_low, self._rx_preamble_high = t, sync, preamble_low, preamble_high
+        self._rx_done = done
 
     def _listen(self):
         if not self.is_receiver:
             raise RuntimeError("Receiver not configured")
-        while True:
+        while not self._closed.is_set():
             self._rx_done = False
-            self._rx_buffer = ''
+            self._rx_buffer = bytearray()
             self._rx_t = None
             self._rx_preamble_low = False
             self._rx_preamble_high = False
-            self._rx_sync_buffer = ''
-            cb = self._pi.callback(self.rx, pigpio.EITHER_EDGE, self._listen_cbf)
+            self._rx_sync_buffer = 0
             while not self._rx_done:
-                pass
-            cb.cancel()
+                if not self._rx_edges: # Edges queued after the last frame ended are demodulated without waiting
+                    self._rx_event.wait() # Sleep until edges arrive, rather than polling when idle
+                    if self._closed.is_set():
+                        return
+                    self._rx_event.clear()
+                    sleep(0.01) # Let edges accumulate (a message spans well over 10ms)
+                self._demodulate()
             try:
-                decoded = self.decode(self._rx_buffer)
-                #print("Raw: " + "".join(map("{:02X}".format, decoded)))
+                decoded = self.decode(bytes(self._rx_buffer))
+                #print("Raw: " + decoded.hex().upper())
             except DecodeError as e:
                 print(str(e), file=stderr)
                 continue
-            os.write(self._write_fd, decoded)
+            os.write(self._write_fd, bytes((len(decoded),)) + decoded) # Length-prefixed, so bursts are not read as one message
 
     @staticmethod
-    def decode(bits: str) -> bytes:
-        if bits.count('X') != 0:
-            raise DecodeError('Message ignored (bad pulse width in {:d} bits): '.format(bits.count('X')) + bits)
+    def decode(bits: bytes) -> bytes:
+        if bits.count(b'X') != 0:
+            raise DecodeError('Message ignored (bad pulse width in {:d} bits): '.format(bits.count(b'X')) + bits.decode('ascii'))
                 
-        raw_hex = ''
-        for i in range(0, len(bits), 4):
-            nibble = "{:X}".format(int(bits[i:i+4][::-1], 2)) # Zero-fill of partial nibbles
-            raw_hex += nibble
-
+        nibbles = (len(bits) + 3) // 4
+        bits += b'0' * (-len(bits) % 8) # Zero-fill of partial nibbles/bytes
+        data = int(bits[::-1] or b'0', 2).to_bytes(len(bits) // 8, 'little') # Bits are sent LSB-first
         try:
-            origin = DeviceType(int(raw_hex[16], 16))
-        except:
+            origin = DeviceType(data[8] & 0xF) # Nibble 16 (the low nibble of each byte is received first)
+        except (IndexError, ValueError):
+            raw_hex = data.translate(SWAPPED_NIBBLES).hex().upper()[:nibbles] # Nibbles in order received
             raise DecodeError('Invalid origin: [' + raw_hex[16:18][::-1] + '], Raw: ' + raw_hex);
 
         if origin == DeviceType.BASE_STATION:
-            unswapped = raw_hex[:-2] # Strip end delimeter
+            length = nibbles - 2 # Strip end delimeter
+        elif data[2] in Message.PAYLOAD_LENGTHS and nibbles > 2 * (9 + Message.PAYLOAD_LENGTHS[data[2]]):
+            length = 2 * (9 + Message.PAYLOAD_LENGTHS[data[2]]) # Header, payload and checksum (no footer); strip end delimeter and repeated sequence
         else:
-            rd = raw_hex.find('F' + raw_hex[0:4])
-            unswapped = raw_hex[:rd] # Strip end delimeter and repeated sequence
-        if len(unswapped) % 2 == 1:
-            raise DecodeError('Message ignored (odd byte count: ' + str(len(unswapped)) + ')')
+            raw_hex = data.translate(SWAPPED_NIBBLES).hex().upper()[:nibbles] # Nibbles in order received
+            length = raw_hex.find('F' + raw_hex[0:4], 22) # Messages are at least 11 bytes (22 nibbles)
+            if length < 0:
+                length = nibbles - 1 # Strip end delimeter and repeated sequence, or just the last nibble
+        if length % 2 == 1:
+            raise DecodeError('Message ignored (odd byte count: ' + str(length) + ')')
+        if length > 48:
+            raise DecodeError('Message ignored (too long: ' + str(length // 2) + ' bytes)')
 
-        swapped = bytes()
-        for i in range(0, len(unswapped), 2):
-            swapped += bytes([int(unswapped[i + 1] + unswapped[i], 16)]) # Swap nibbles and convert to bytes
-        return swapped
+        return data[:length // 2]
 
     def fileno(self):
         return self._read_fd
 
     def recv(self):
-        return Message.factory(os.read(self._read_fd, 24))
+        n = os.read(self._read_fd, 1)[0]
+        return Message.factory(os.read(self._read_fd, n))
+
+    def recv_batch(self, max_msgs: int=16) -> list:
+        msgs = [self.recv()]
+        while len(msgs) < max_msgs and select([self._read_fd], [], [], 0)[0]:
+            try:
+                msgs.append(self.recv())
+            except ValueError as e: # Don't drop the messages already read
+                print(str(e), file=stderr)
+        return msgs
 
     def send(self, msg: Message, mode='script'):
 
@@ -168,126 +208,102 @@ class Transceiver(AbstractTransceiver):
             raise ValueError
 
         # TODO: This should be handled at an upper layer, as the triple transmission will end if a sensor state changes before completion
-        if isinstance(msg, SensorMessage):
-            for i in range(3):
-                f(msg)
-                sleep(2)
-        else:
-            f(msg)
+        f(msg, self._framing(type(msg))[2]) # Sensor messages repeated by pigpiod, 2 seconds apart
         print("Message transmitted.")
 
-    def send_wave(self, msg: Message):
-        w = []
-        if isinstance(msg, BaseStationKeypadMessage):
-            syncs = 150
-        elif isinstance(msg, KeypadMessage):
-            syncs = 40
-        elif isinstance(msg, SensorMessage):
-            syncs = 20
-        else:
-            raise TypeError
-        next_bit = 0
-        for i in range(syncs):
-            w.append(pigpio.pulse(0, self.tx, 1000))
-            w.append(pigpio.pulse(self.tx, 0, 1000))
-        wd = []
-        wd.append(pigpio.pulse(0, self.tx, 2000))
-        wd.append(pigpio.pulse(self.tx, 0, 2000))
-        next_bit = 0
-        for msg_byte in bytes(msg):
-            for i in range(8):
-                if msg_byte & (1 << i):
-                    d = 1000
-                else:
-                    d = 500
-                if next_bit == 1:
-                    wd.append(pigpio.pulse(self.tx, 0, d))
-                else:
-                    wd.append(pigpio.pulse(0, self.tx, d))
-                next_bit ^= 1    
-        if isinstance(msg, BaseStationKeypadMessage):
-            ds = [1000, 1000, 500, 500]
-            for d in ds:
-                if next_bit == 1:
-                    wd.append(pigpio.pulse(self.tx, 0, d))
-                else:
-                    wd.append(pigpio.pulse(0, self.tx, d))
+    def send_wave(self, msg: Message, repeats: int=1):
+        syncs, from_base_station, _ = self._framing(type(msg))
+        sync_wid = self._sync_wave(syncs)
+        p = self._pulses # Keyed by (level, microseconds)
+        wd = [p[0, 2000], p[1, 2000]]
+        for byte in bytes(msg):
+            wd += self._byte_pulses[byte]
+        next_bit = 0 # Whole bytes are an even number of bits
+        if from_base_station:
+            for d in (1000, 1000, 500, 500):
+                wd.append(p[next_bit, d])
                 next_bit ^= 1
         for i in range(4):
-            if next_bit == 1:
-                wd.append(pigpio.pulse(self.tx, 0, 1000))
-            else:
-                wd.append(pigpio.pulse(0, self.tx, 1000))
-            next_bit ^= next_bit
-        if isinstance(msg, BaseStationKeypadMessage):
-            ws = []
-            for i in range(18):
-                ws.append(pigpio.pulse(0, self.tx, 1000))
-                ws.append(pigpio.pulse(self.tx, 0, 1000))
-            w = w + wd + ws + wd + ws + wd
-        elif isinstance(msg, ComponentMessage):
-            w = w + wd + wd
+            wd.append(p[next_bit, 1000])
+            next_bit ^= 1
+        if from_base_station:
+            ws = [p[0, 1000], p[1, 1000]] * 18
+            w = wd + ws + wd + ws + wd
         else:
-            raise TypeError
-        self._pi.wave_clear()
+            w = wd + wd
         self._pi.wave_add_generic(w)
         wid = self._pi.wave_create()
         if wid < 0:
             raise Exception("Message wave creation failed!")
-        self._pi.wave_send_once(wid)
+        chain = [sync_wid, wid]
+        if repeats > 1:
+            gap = [255, 0, 255, 2, 0x50, 0xC3, 255, 1, 40, 0] # 2 seconds (40 x 50ms delay)
+            chain = [255, 0] + chain + gap + [255, 1, repeats, 0]
+        self._pi.wave_chain(chain)
+        micros = (self._pi.wave_get_micros() + 2000 * syncs) * repeats + 2000000 * (repeats - 1)
+        sleep(micros / 1000000) # Expected chain duration, then poll for the tail
         while self._pi.wave_tx_busy():
-            sleep(1)
-        self._pi.wave_clear()
-        self._pi.stop()
+            sleep(0.001)
+        self._pi.wave_delete(wid)
+
+    @classmethod
+    def _framing(cls, msg_cls: type) -> tuple:
+        if msg_cls not in cls.FRAMING:
+            if issubclass(msg_cls, BaseStationKeypadMessage):
+                cls.FRAMING[msg_cls] = (150, True, 1)
+            elif issubclass(msg_cls, KeypadMessage):
+                cls.FRAMING[msg_cls] = (40, False, 1)
+            elif issubclass(msg_cls, SensorMessage):
+                cls.FRAMING[msg_cls] = (20, False, 3)
+            else:
+                raise TypeError
+        return cls.FRAMING[msg_cls]
+
+    def _sync_wave(self, syncs: int) -> int:
+        if syncs not in self._sync_waves:
+            self._pi.wave_add_generic([self._pulses[0, 1000], self._pulses[1, 1000]] * syncs)
+            wid = self._pi.wave_create()
+            if wid < 0:
+                raise Exception("SYNC wave creation failed!")
+            self._sync_waves[syncs] = wid
+        return self._sync_waves[syncs]
 
-    def send_script(self, msg: Message):
+    def send_script(self, msg: Message, repeats: int=1):
+        syncs, from_base_station, _ = self._framing(type(msg))
         s = []
-        if isinstance(msg, BaseStationKeypadMessage):
-            s.append("ld v0 150 tag 0 w " + str(self.tx) + " 0 mics 1000 w " + str(self.tx) + " 1 mics 1000 dcr v0 jp 0")
-        elif isinstance(msg, KeypadMessage):
-            s.append("ld v0 40 tag 0 w " + str(self.tx) + " 0 mics 1000 w " + str(self.tx) + " 1 mics 1000 dcr v0 jp 0")
-        elif isinstance(msg, SensorMessage):
-            s.append("ld v0 20 tag 0 w " + str(self.tx) + " 0 mics 1000 w " + str(self.tx) + " 1 mics 1000 dcr v0 jp 0")
-        else:
-            raise TypeError
+        s.append("ld v0 " + str(syncs) + " tag 0 w " + str(self.tx) + " 0 mics 1000 w " + str(self.tx) + " 1 mics 1000 dcr v0 jp 0")
         preamble = "w " + str(self.tx) + " 0 mics 2000 w " + str(self.tx) + " 1 mics 2000"
         s.append(preamble)
-        next_bit = 0
-        for msg_byte in bytes(msg):
-            for i in range(8):
-                s_i = "w " + str(self.tx) + " " + str(next_bit) + " mics "
-                if msg_byte & (1 << i):
-                    s_i += "1000"
-                else:
-                    s_i += "500"
-                s.append(s_i)
-                next_bit ^= 1
-        if isinstance(msg, BaseStationKeypadMessage):
-            s.append("w " + str(self.tx) + " " + str(next_bit) + " mics 1000")
-            s.append("w " + str(self.tx) + " " + str(next_bit) + " mics 1000")
-            s.append("w " + str(self.tx) + " " + str(next_bit) + " mics 500")
-            s.append("w " + str(self.tx) + " " + str(next_bit) + " mics 500")
+        w = self._script_writes # Indexed by next_bit
+        s += map(self._byte_scripts.__getitem__, bytes(msg))
+        next_bit = 0 # Whole bytes are an even number of bits
+        if from_base_station:
+            s.append(w[next_bit] + "1000")
+            s.append(w[next_bit] + "1000")
+            s.append(w[next_bit] + "500")
+            s.append(w[next_bit] + "500")
             next_bit ^= 1
         for i in range(4):
-            s.append("w " + str(self.tx) + " " + str(next_bit) + " mics 1000")
+            s.append(w[next_bit] + "1000")
             next_bit ^= 1
         sd = s[1:]
-        if isinstance(msg, BaseStationKeypadMessage):
+        if from_base_station:
             s.append("ld v0 18 tag 1 w " + str(self.tx) + " " + str(next_bit) + " mics 1000 w " + str(self.tx) + " " + str(next_bit) + " mics 1000 dcr v0 jp 1")
             next_bit ^= 1
             s = s + sd
             s.append("ld v0 18 tag 2 w " + str(self.tx) + " " + str(next_bit) + " mics 1000 w " + str(self.tx) + " " + str(next_bit) + " mics 1000 dcr v0 jp 2")
             next_bit ^= 1
             s = s + sd
-        elif isinstance(msg, ComponentMessage):
-            s = s + sd
         else:
-            raise TypeError
+            s = s + sd
         s.append("w " + str(self.tx) + " 0")
+        if repeats > 1:
+            s = ["ld v1 " + str(repeats - 1) + " tag 3"] + s + ["mils 2000 dcr v1 jp 3"]
         sid = self._pi.store_script(bytes(" ".join(s), 'ascii'))
         if sid < 0:
             raise Exception("Script failed to store!")
         self._pi.run_script(sid)
+        sleep((2000 * syncs * repeats + 2000000 * (repeats - 1)) / 1000000) # SYNC loops and repeat gaps alone take this long, so don't poll before then
         while True:
             (s, _) = self._pi.script_status(sid)
             if s == pigpio.PI_SCRIPT_FAILED:
@@ -295,3 +311,4 @@ class Transceiver(AbstractTransceiver):
             elif s == pigpio.PI_SCRIPT_HALTED:
                 self._pi.delete_script(sid)
                 break
+            sleep(0.005)
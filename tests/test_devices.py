@@ -0,0 +1,283 @@
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from threading import Event
+from time import monotonic, sleep, time
+from unittest.mock import patch
+
+from simplisafe import ArmedState, DeviceType
+from simplisafe.devices import SCHEDULER, AbstractDevice, AbstractTransceiver, BaseStation, Keypad, Scheduler
+from simplisafe.messages import *
+
+
+class FakeTransceiver(AbstractTransceiver):
+
+    def __init__(self, batches=()):
+        self.batches = list(batches)
+        self.sent = []
+
+    def recv_batch(self, max_msgs: int=16) -> list:
+        if not self.batches:
+            Event().wait() # Nothing more to receive
+        batch = self.batches.pop(0)
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+
+KEYPAD = {"name": "Keypad", "type": DeviceType.KEYPAD, "sn": "167JC", "setting": BaseStation.KeypadSetting.PANIC_ENABLED}
+
+
+class TestBaseStation(unittest.TestCase):
+
+    def test_init(self):
+        txr = FakeTransceiver()
+        bs = BaseStation(txr, "123456", "1234", components=[KEYPAD])
+        self.assertEqual(bs._components["167JC"]["name"], "Keypad")
+        self.assertEqual([type(msg).__name__ for msg in txr.sent], [
+            'BaseStationKeypadPowerOnUpdate',
+            'BaseStationKeypadTestModeOnUpdate',
+            'BaseStationKeypadClearSensorError1Update',
+            'BaseStationKeypadClearSensorError2Update',
+            'BaseStationKeypadClearSensorError3Update',
+            'BaseStationKeypadClearSensorError4Update'
+        ])
+
+    def test_heartbeat_overdue(self):
+        alerts = []
+        class AlertingBaseStation(BaseStation):
+            def alert(self, alert_type, sn):
+                alerts.append((alert_type, sn))
+        bs = AlertingBaseStation(FakeTransceiver(), "123456", "1234", components=[KEYPAD])
+        bs._components["167JC"]["last_heartbeat"] = time() - BaseStation.HEARTBEAT_TIMEOUT - 1
+        self.assertTrue(bs._heartbeat_timer())
+        self.assertTrue(bs._heartbeat_timer()) # Still overdue, and still checked
+        self.assertEqual(alerts, [(BaseStation.AlertType.SENSOR_NOT_RESPONDING, "167JC")] * 2)
+
+    def test_heartbeat_alert_raises(self):
+        class FailingBaseStation(BaseStation):
+            def alert(self, alert_type, sn):
+                raise OSError("Hook failed")
+        bs = FailingBaseStation(FakeTransceiver(), "123456", "1234", components=[KEYPAD])
+        bs._components["167JC"]["last_heartbeat"] = time() - BaseStation.HEARTBEAT_TIMEOUT - 1
+        with redirect_stderr(StringIO()):
+            self.assertTrue(bs._heartbeat_timer())
+
+
+class TestRecv(unittest.TestCase):
+
+    def test_errors(self):
+        processed = []
+        done = Event()
+        class Device(AbstractDevice):
+            def _process_msg(self, msg):
+                processed.append(msg)
+                if msg == 'handler error':
+                    raise RuntimeError("Handler failed")
+                if msg == 'last':
+                    done.set()
+        txr = FakeTransceiver([['handler error', 'next'], ValueError("Undecodable frame"), ['last']])
+        with redirect_stderr(StringIO()) as traceback, patch('simplisafe.devices.stderr', new_callable=StringIO) as stderr:
+            Device(txr, "ABCDE")
+            self.assertTrue(done.wait(1))
+        self.assertEqual(processed, ['handler error', 'next', 'last'])
+        self.assertIn("Handler failed", traceback.getvalue())
+        self.assertIn("Undecodable frame", stderr.getvalue())
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_order(self):
+        scheduler = Scheduler()
+        calls = []
+        done = Event()
+        scheduler.enter(0.06, done.set)
+        scheduler.enter(0.04, calls.append, 2)
+        scheduler.enter(0.02, calls.append, 1)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(calls, [1, 2])
+
+    def test_cancel(self):
+        scheduler = Scheduler()
+        calls = []
+        done = Event()
+        event = scheduler.enter(0.02, calls.append, 1)
+        scheduler.enter(0.04, done.set)
+        scheduler.cancel(event)
+        scheduler.cancel(None)
+        self.assertTrue(done.wait(1))
+        scheduler.cancel(event) # Already cancelled
+        self.assertEqual(calls, [])
+
+    def test_exception(self):
+        scheduler = Scheduler()
+        done = Event()
+        def fail():
+            raise RuntimeError("Call failed")
+        with redirect_stderr(StringIO()):
+            scheduler.enter(0.01, fail)
+            scheduler.enter(0.02, done.set)
+            self.assertTrue(done.wait(1))
+
+    def test_lazy_start(self):
+        scheduler = Scheduler()
+        self.assertIsNone(scheduler._thread)
+        scheduler.enter(0, lambda: None)
+        self.assertTrue(scheduler._thread.is_alive())
+
+
+class TestRepeat(unittest.TestCase):
+
+    def test_no_drift(self):
+        times = []
+        def tick():
+            times.append(monotonic())
+            sleep(0.02) # Late calls must not push back the later ones
+            return len(times) < 5
+        AbstractDevice._repeat(0.05, tick)
+        sleep(0.4)
+        self.assertEqual(len(times), 5)
+        self.assertLess(times[-1] - times[0], 4 * 0.05 + 0.03)
+
+    def test_stop(self):
+        calls = []
+        stop = AbstractDevice._repeat(0.01, lambda: calls.append(1) or True)
+        sleep(0.05)
+        stop.set()
+        sleep(0.02)
+        n = len(calls)
+        sleep(0.05)
+        self.assertGreater(n, 0)
+        self.assertEqual(len(calls), n)
+
+    def test_raise_ends_repeat(self):
+        calls = []
+        def tick():
+            calls.append(1)
+            raise RuntimeError("Tick failed")
+        with redirect_stderr(StringIO()):
+            AbstractDevice._repeat(0.01, tick)
+            sleep(0.1)
+        self.assertEqual(len(calls), 1)
+
+
+class SirenBaseStation(BaseStation):
+
+    def __init__(self, *args, **kwargs):
+        self.siren = []
+        super().__init__(*args, **kwargs)
+
+    def start_siren(self):
+        self.siren.append('start')
+
+    def stop_siren(self):
+        self.siren.append('stop')
+
+
+class TestSiren(unittest.TestCase):
+
+    def test_timeout(self):
+        bs = SirenBaseStation(FakeTransceiver(), "123456", "1234")
+        bs._settings["siren_duration"] = 0.05 / 60 # Minutes
+        bs._alarm()
+        bs._alarm() # Does not restart the siren
+        self.assertEqual(bs.siren, ['start'])
+        sleep(0.1)
+        self.assertEqual(bs.siren, ['start', 'stop'])
+        self.assertIsNone(bs._siren_timer)
+
+    def test_disarm(self):
+        bs = SirenBaseStation(FakeTransceiver(), "123456", "1234")
+        bs._settings["siren_duration"] = 0.05 / 60
+        bs._alarm()
+        bs._disarm()
+        sleep(0.1)
+        self.assertEqual(bs.siren, ['start', 'stop']) # Stopped once, by disarming
+
+
+class TestKeypadBacklight(unittest.TestCase):
+
+    def test_backlight_timer(self):
+        backlight = []
+        class BacklitKeypad(Keypad):
+            def backlight(self, on):
+                backlight.append(on)
+        kp = BacklitKeypad(FakeTransceiver(), "167JC")
+        self.assertEqual(backlight, [False])
+        kp._display()
+        first = kp._backlight_timer
+        self.assertEqual((first.action, first.argument), (kp.backlight, (False,)))
+        self.assertAlmostEqual(first.time - monotonic(), 20, delta=1)
+        kp._display() # Restarts the timer
+        self.assertNotIn(first, SCHEDULER._sched.queue)
+        self.assertIn(kp._backlight_timer, SCHEDULER._sched.queue)
+        self.assertEqual(backlight, [False, True, True])
+        SCHEDULER.cancel(kp._backlight_timer)
+
+
+class TestKeypadHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.txr = FakeTransceiver()
+        self.kp = Keypad(self.txr, "167JC")
+
+    def tearDown(self):
+        SCHEDULER.cancel(self.kp._enter_menu_timer)
+        SCHEDULER.cancel(self.kp._backlight_timer)
+        self.kp._cancel_countdown()
+
+    def test_every_handler(self):
+        ess = BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ENTRY_SENSOR_CLOSED
+        msgs = [
+            BaseStationKeypadExtendedStatusResponse("167JC", 0, "123456", 0, ArmedState.OFF, ess, 0, 0),
+            BaseStationKeypadExtendedStatusUpdate("167JC", 0, "123456", 0, ArmedState.OFF, ess, 0, 0),
+            BaseStationKeypadExtendedStatusRemoteUpdate("167JC", 0, "123456", 0, ArmedState.OFF, ess, 0, 0),
+            BaseStationKeypadStatusUpdate("167JC", 0, "123456", 0),
+            BaseStationKeypadAlarmPinResponse("167JC", 0, "123456", BaseStationKeypadAlarmPinResponse.ResponseType.DISARM),
+            BaseStationKeypadInvalidMenuPinResponse("167JC", 0),
+            BaseStationKeypadValidMenuPinResponse("167JC", 0),
+            BaseStationKeypadHomeResponse("167JC", 0, "123456"),
+            BaseStationKeypadAwayResponse("167JC", 0, "123456"),
+            BaseStationKeypadOffRemoteUpdate("167JC", 0, "123456"),
+            BaseStationKeypadEnterMenuResponse("167JC", 0),
+            BaseStationKeypadNewPrefixResponse("167JC", 0)
+        ]
+        self.assertEqual({type(msg) for msg in msgs}, set(Keypad.HANDLERS) - {BaseStationKeypadMessage})
+        for msg in msgs:
+            with self.subTest(type(msg).__name__):
+                self.kp._process_msg(msg)
+
+    def test_extended_status(self):
+        ess = BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ENTRY_SENSOR_CLOSED
+        self.kp._process_msg(BaseStationKeypadExtendedStatusUpdate("167JC", 0, "123456", 0, ArmedState.ARMING_AWAY, ess, 30, 0))
+        self.assertTrue(self.kp.is_arming())
+        self.assertEqual(self.kp._time_left, 29) # First tick runs immediately
+        self.assertIsNotNone(self.kp._time_left_stop)
+
+    def test_enter_menu(self):
+        self.kp._entry_buffer = '12'
+        self.kp._process_msg(BaseStationKeypadEnterMenuResponse("167JC", 0))
+        self.assertEqual((self.kp._page, self.kp._entry_buffer), (Keypad.Page.ENTER_MENU_PIN, ''))
+        timer = self.kp._enter_menu_timer
+        self.assertEqual(timer.action, self.kp._menu_cancel)
+        self.kp._process_msg(BaseStationKeypadInvalidMenuPinResponse("167JC", 0)) # Restarts the timer
+        self.assertNotIn(timer, SCHEDULER._sched.queue)
+        self.kp._process_msg(BaseStationKeypadValidMenuPinResponse("167JC", 0))
+        self.assertNotIn(self.kp._enter_menu_timer, SCHEDULER._sched.queue)
+        self.assertEqual(self.kp._menu_page, Keypad.Menu.CHANGE_PIN)
+
+    def test_menu_cancel(self):
+        self.kp._process_msg(BaseStationKeypadEnterMenuResponse("167JC", 0))
+        self.kp._process_msg(BaseStationKeypadValidMenuPinResponse("167JC", 0))
+        del self.txr.sent[:]
+        self.kp._menu_cancel()
+        self.assertEqual([type(msg) for msg in self.txr.sent], [KeypadExitMenuRequest])
+        self.assertEqual((self.kp._page, self.kp._menu_page), (Keypad.Page.ALARM_STATE, None))
+        self.assertFalse(self.kp.in_menu())
+
+
+if __name__ == '__main__':
+    unittest.main()
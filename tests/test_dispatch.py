@@ -0,0 +1,140 @@
+import unittest
+
+from simplisafe import ArmedState
+from simplisafe.messages import *
+
+KP_SN = 'ABCDE'
+BS_SN = '01AB2C'
+C_SN = '1234A'
+
+
+class TestDispatch(unittest.TestCase):
+
+    MESSAGES = ( # One of each concrete class; covers every DISPATCH key, and the _dispatch_any classes (the extended status, serial, simple, scroll and sensor error messages)
+        KeypadRemoveComponentScrollMenuRequest(KP_SN, 3, 1),
+        KeypadAlarmPinRequest(KP_SN, 3, '1234'),
+        KeypadNewPinRequest(KP_SN, 3, '1234'),
+        KeypadMenuPinRequest(KP_SN, 3, '1234'),
+        KeypadExtendedStatusRequest(KP_SN, 3),
+        KeypadTestModeOnRequest(KP_SN, 3),
+        KeypadTestModeOffRequest(KP_SN, 3),
+        KeypadRemoveComponentMenuRequest(KP_SN, 3),
+        KeypadHomeRequest(KP_SN, 3),
+        KeypadPanicRequest(KP_SN, 3),
+        KeypadAwayRequest(KP_SN, 3),
+        KeypadOffRequest(KP_SN, 3),
+        KeypadEnterMenuRequest(KP_SN, 3),
+        KeypadExitMenuRequest(KP_SN, 3),
+        KeypadChangePinMenuRequest(KP_SN, 3),
+        KeypadChangePinConfirmMenuRequest(KP_SN, 3),
+        KeypadChangePrefixMenuRequest(KP_SN, 3),
+        KeypadAddComponentMenuRequest(KP_SN, 3),
+        KeypadRemoveComponentSelectMenuRequest(KP_SN, 3),
+        KeypadAddComponentLastTypeMenuRequest(KP_SN, 3),
+        KeypadPrefixRequest(KP_SN, 3, 5),
+        KeypadRemoveComponentConfirmMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddEntrySensorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddMotionSensorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddPanicButtonMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddKeychainRemoteMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddGlassbreakSensorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddCoDetectorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddFreezeSensorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddWaterSensorMenuRequest(KP_SN, 3, C_SN),
+        KeypadAddComponentTypeMenuRequest(KP_SN, 3, KeypadAddComponentTypeMenuRequest.ComponentType.ENTRY_SENSOR),
+        BaseStationKeypadExtendedStatusResponse(KP_SN, 3, BS_SN, 0, ArmedState.ARMED_AWAY, BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ALARM_KEYPAD, 1, 1),
+        BaseStationKeypadPowerOnUpdate(KP_SN, 3, BS_SN, 0, ArmedState.ARMED_AWAY, BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ALARM_KEYPAD, 1, 1),
+        BaseStationKeypadExtendedStatusUpdate(KP_SN, 3, BS_SN, 0, ArmedState.ARMED_AWAY, BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ALARM_KEYPAD, 1, 1),
+        BaseStationKeypadExtendedStatusRemoteUpdate(KP_SN, 3, BS_SN, 0, ArmedState.ARMED_AWAY, BaseStationKeypadExtendedStatusMessage.EntrySensorStatusType.ALARM_KEYPAD, 1, 1),
+        BaseStationKeypadStatusUpdate(KP_SN, 3, BS_SN, 0),
+        BaseStationKeypadAlarmPinResponse(KP_SN, 3, BS_SN, BaseStationKeypadAlarmPinResponse.ResponseType.INVALID),
+        BaseStationKeypadHomeResponse(KP_SN, 3, BS_SN),
+        BaseStationKeypadAlarmUpdate(KP_SN, 3, BS_SN),
+        BaseStationKeypadAwayResponse(KP_SN, 3, BS_SN),
+        BaseStationKeypadOffRemoteUpdate(KP_SN, 3, BS_SN),
+        BaseStationKeypadEnterMenuResponse(KP_SN, 3),
+        BaseStationKeypadNewPrefixResponse(KP_SN, 3),
+        BaseStationKeypadRemoveComponentSelectMenuResponse(KP_SN, 3),
+        BaseStationKeypadRemoveComponentConfirmMenuResponse(KP_SN, 3),
+        BaseStationKeypadAddEntrySensorMenuResponse(KP_SN, 3, BaseStationKeypadAddEntrySensorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddMotionSensorMenuResponse(KP_SN, 3, BaseStationKeypadAddMotionSensorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddPanicButtonMenuResponse(KP_SN, 3, BaseStationKeypadAddPanicButtonMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddKeychainRemoteMenuResponse(KP_SN, 3, BaseStationKeypadAddKeychainRemoteMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddGlassbreakSensorMenuResponse(KP_SN, 3, BaseStationKeypadAddGlassbreakSensorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddCoDetectorMenuResponse(KP_SN, 3, BaseStationKeypadAddCoDetectorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddFreezeSensorMenuResponse(KP_SN, 3, BaseStationKeypadAddFreezeSensorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadAddWaterSensorMenuResponse(KP_SN, 3, BaseStationKeypadAddWaterSensorMenuResponse.ResponseType.COMPONENT_ADDED),
+        BaseStationKeypadTestModeOnResponse(KP_SN, 3, BS_SN),
+        BaseStationKeypadTestModeOnUpdate(KP_SN, 3, BS_SN),
+        BaseStationKeypadOffResponse(KP_SN, 3, BS_SN),
+        BaseStationKeypadTestModeOffResponse(KP_SN, 3, BS_SN),
+        BaseStationKeypadTestModeOffUpdate(KP_SN, 3, BS_SN),
+        BaseStationKeypadExitMenuResponse(KP_SN, 3),
+        BaseStationKeypadChangePinMenuResponse(KP_SN, 3),
+        BaseStationKeypadChangePinConfirmMenuResponse(KP_SN, 3),
+        BaseStationKeypadChangePrefixMenuResponse(KP_SN, 3),
+        BaseStationKeypadAddComponentMenuResponse(KP_SN, 3),
+        BaseStationKeypadAddComponentTypeMenuResponse(KP_SN, 3),
+        BaseStationKeypadClearSensorError1Update(KP_SN, 3, BS_SN),
+        BaseStationKeypadClearSensorError2Update(KP_SN, 3, BS_SN),
+        BaseStationKeypadClearSensorError3Update(KP_SN, 3, BS_SN),
+        BaseStationKeypadClearSensorError4Update(KP_SN, 3, BS_SN),
+        BaseStationKeypadRemoveEntrySensorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveMotionSensorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemovePanicButtonScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveKeypadScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveKeychainRemoteScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveGlassbreakSensorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveSmokeDetectorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveCoDetectorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveFreezeSensorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadRemoveWaterSensorScrollMenuResponse(KP_SN, 3, C_SN, True, True),
+        BaseStationKeypadInvalidMenuPinResponse(KP_SN, 3),
+        BaseStationKeypadValidMenuPinResponse(KP_SN, 3),
+        BaseStationKeypadEntrySensorUpdate(KP_SN, 3, BS_SN, 1),
+        BaseStationKeypadSensorErrorUpdate(KP_SN, 3, BS_SN, 0, C_SN),
+        BaseStationKeypadSensorErrorUpdate(KP_SN, 3, BS_SN, 3, C_SN),
+        KeychainRemoteMessage(C_SN, 3, KeychainRemoteMessage.EventType.PANIC),
+        PanicButtonMessage(C_SN, 3, PanicButtonMessage.EventType.BUTTON_PRESS),
+        MotionSensorMessage(C_SN, 3, MotionSensorMessage.EventType.HEARTBEAT),
+        EntrySensorMessage(C_SN, 3, EntrySensorMessage.EventType.OPEN),
+        GlassbreakSensorMessage(C_SN, 3, GlassbreakSensorMessage.EventType.HEARTBEAT),
+        SmokeDetectorMessage(C_SN, 3, SmokeDetectorMessage.EventType.HEARTBEAT)
+    )
+
+    def test_decode(self):
+        for msg in self.MESSAGES:
+            with self.subTest(cls=type(msg).__name__):
+                b = bytes(msg)
+                decoded = Message.factory(b)
+                self.assertIs(type(decoded), type(msg))
+                self.assertEqual(bytes(decoded), b)
+
+    def test_shared_event_type(self):
+        # ADD_GLASSBREAK_SENSOR_MENU_REQUEST and ADD_SMOKE_DETECTOR_MENU_REQUEST share 0x6E, so the class defined first wins
+        msg = KeypadAddSmokeDetectorMenuRequest(KP_SN, 3, C_SN)
+        self.assertIs(type(Message.factory(bytes(msg))), KeypadAddGlassbreakSensorMenuRequest)
+        msg = BaseStationKeypadAddSmokeDetectorMenuResponse(KP_SN, 3, BaseStationKeypadAddComponentSerialMenuResponse.ResponseType.COMPONENT_ADDED)
+        self.assertIs(type(Message.factory(bytes(msg))), BaseStationKeypadAddGlassbreakSensorMenuResponse)
+
+    def test_subclass_order(self):
+        classes = [Message]
+        for cls in classes: # Grows as it goes, so the whole tree is covered
+            with self.subTest(cls=cls.__name__):
+                self.assertEqual(cls._subclasses, cls.__subclasses__()) # Definition order, as from_parent tries them
+            classes += cls._subclasses
+        self.assertEqual(Message._subclasses, [ComponentMessage, BaseStationKeypadMessage])
+        self.assertEqual(BaseStationKeypadMessage._dispatch_any[0], BaseStationKeypadExtendedStatusMessage)
+        self.assertEqual(BaseStationKeypadMessage._dispatch_any[-1], BaseStationKeypadSensorErrorUpdate)
+
+    def test_sensor_origin_type(self):
+        self.assertEqual(set(SensorMessage._dispatch), {DeviceType.KEYCHAIN_REMOTE, DeviceType.PANIC_BUTTON, DeviceType.MOTION_SENSOR, DeviceType.ENTRY_SENSOR, DeviceType.GLASSBREAK_SENSOR, DeviceType.SMOKE_DETECTOR})
+        b = bytearray(bytes(EntrySensorMessage(C_SN, 3, EntrySensorMessage.EventType.OPEN)))
+        b[8] = (b[8] & 0xF0) | DeviceType.CO_DETECTOR # No CO detector message class
+        b[10] = sum(b[8:10]) & 0xFF
+        with self.assertRaises(UnimplementedMessageError):
+            Message.factory(bytes(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
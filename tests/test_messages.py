@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+from simplisafe.messages import InvalidMessageBytesError, KeypadAddEntrySensorMenuRequest, KeypadMessage, KeypadPrefixRequest, Message, UnimplementedMessageError
+
+
+class TestModifyComponentMenuRequest(unittest.TestCase):
+
+    def test_add_entry_sensor_decode(self):
+        b = bytes.fromhex('cc056641424344450134214301106913')
+        msg = Message.factory(b)
+        self.assertIsInstance(msg, KeypadAddEntrySensorMenuRequest)
+        self.assertEqual(msg.sn, 'ABCDE')
+        self.assertEqual(msg.c_sn, '1234A')
+        self.assertEqual(msg.event_type, KeypadMessage.EventType.ADD_ENTRY_SENSOR_MENU_REQUEST)
+        self.assertEqual(bytes(msg), b)
+
+    def test_unknown_event_type(self):
+        with self.assertRaises(InvalidMessageBytesError):
+            Message.factory(bytes.fromhex('cc05664142434445013421430ff011a9'))
+
+
+class ClearedDict(dict):
+
+    def __setitem__(self, key, value): # As if another thread cleared the cache straight after
+        super().__setitem__(key, value)
+        self.clear()
+
+
+class TestFactoryCache(unittest.TestCase):
+
+    def test_copies(self):
+        b = bytes.fromhex('cc056641424344450134214301106913')
+        first, second = Message.factory(b), Message.factory(b)
+        self.assertIsNot(first, second)
+        self.assertIs(type(first), type(second))
+        self.assertEqual(bytes(first), bytes(second))
+
+    def test_errors(self):
+        b = bytes.fromhex('cc05664142434445013421430ff011a9')
+        for _ in range(2):
+            with self.assertRaises(UnimplementedMessageError):
+                Message.factory(b)
+
+    def test_cleared(self):
+        b = bytes.fromhex('cc056641424344450134214301106913')
+        with patch.object(Message, 'DECODED', ClearedDict()):
+            self.assertIsInstance(Message.factory(b), KeypadAddEntrySensorMenuRequest)
+
+
+class TestKeypadPrefixRequest(unittest.TestCase):
+
+    def test_round_trip(self):
+        for prefix in (None, 0, 5, 9):
+            with self.subTest(prefix=prefix):
+                b = bytes(KeypadPrefixRequest('ABCDE', 3, prefix))
+                msg = Message.factory(b)
+                self.assertIsInstance(msg, KeypadPrefixRequest)
+                self.assertEqual(msg.prefix, prefix)
+                self.assertEqual(bytes(msg), b)
+
+    def test_layout(self):
+        self.assertEqual(KeypadPrefixRequest('ABCDE', 3, 5).payload_body, bytes.fromhex('F5FFCFFF'))
+
+    def test_invalid_digit(self):
+        b = bytearray(bytes(KeypadPrefixRequest('ABCDE', 3, 5)))
+        b[10] = 0xFA # Prefix digit 0xA
+        b[15] = sum(b[8:15]) & 0xFF
+        with self.assertRaises(InvalidMessageBytesError):
+            Message.factory(bytes(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from simplisafe.messages import *
+from simplisafe.pigpio import DecodeError, Transceiver
+
+KP_SN = 'ABCDE'
+BS_SN = '01AB2C'
+
+
+class PipeTransceiver(Transceiver):
+
+    def __init__(self): # Just the pipe the listener thread writes to; no pigpiod connection
+        self._read_fd, self._write_fd = os.pipe()
+
+    def close(self):
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+    def write(self, b: bytes):
+        os.write(self._write_fd, bytes((len(b),)) + b) # As Transceiver._listen frames decoded messages
+
+
+class TestRecvBatch(unittest.TestCase):
+
+    MESSAGES = (
+        KeypadHomeRequest(KP_SN, 3),
+        BaseStationKeypadHomeResponse(KP_SN, 3, BS_SN),
+        KeypadAlarmPinRequest(KP_SN, 7, '1234')
+    )
+
+    def setUp(self):
+        self.txr = PipeTransceiver()
+
+    def tearDown(self):
+        self.txr.close()
+
+    def test_back_to_back(self):
+        for msg in self.MESSAGES:
+            self.txr.write(bytes(msg))
+        msgs = self.txr.recv_batch()
+        self.assertEqual([type(msg) for msg in msgs], [type(msg) for msg in self.MESSAGES])
+        self.assertEqual([bytes(msg) for msg in msgs], [bytes(msg) for msg in self.MESSAGES])
+
+    def test_max_msgs(self):
+        for msg in self.MESSAGES:
+            self.txr.write(bytes(msg))
+        self.assertEqual(len(self.txr.recv_batch(2)), 2)
+        self.assertEqual(len(self.txr.recv_batch(2)), 1)
+
+    def test_bad_frame(self):
+        self.txr.write(bytes(self.MESSAGES[0]))
+        self.txr.write(bytes.fromhex('cc05664142434445013421430ff011a9')) # Unknown event type
+        self.txr.write(bytes(self.MESSAGES[1]))
+        with patch('simplisafe.pigpio.stderr', new_callable=StringIO) as stderr:
+            msgs = self.txr.recv_batch()
+        self.assertEqual([type(msg) for msg in msgs], [type(msg) for msg in self.MESSAGES[:2]])
+        self.assertIn("Unimplemented", stderr.getvalue())
+
+    def test_bad_first_frame(self):
+        self.txr.write(bytes.fromhex('cc05664142434445013421430ff011a9'))
+        self.txr.write(bytes(self.MESSAGES[0]))
+        with self.assertRaises(UnimplementedMessageError):
+            self.txr.recv_batch()
+        self.assertEqual([type(msg) for msg in self.txr.recv_batch()], [type(self.MESSAGES[0])])
+
+
+def nibbles(b: bytes) -> str:
+    return ''.join('{:X}{:X}'.format(i & 0xF, i >> 4) for i in b) # In the order received, low nibble first
+
+
+def bits(nibbles: str) -> bytes:
+    return ''.join('{:04b}'.format(int(n, 16))[::-1] for n in nibbles).encode() # As demodulated, LSB first
+
+
+class TestDecode(unittest.TestCase):
+
+    FRAME = bytes(KeypadHomeRequest(KP_SN, 3))
+
+    def test_full_repeat(self):
+        n = nibbles(self.FRAME)
+        self.assertEqual(Transceiver.decode(bits(n + 'F' + n)), self.FRAME)
+
+    def test_truncated_repeat(self):
+        n = nibbles(self.FRAME)
+        for i in range(len(n)):
+            with self.subTest(repeated_nibbles=i):
+                self.assertEqual(Transceiver.decode(bits(n + 'F' + n[:i])), self.FRAME)
+
+    def test_sensor(self):
+        frame = bytes(EntrySensorMessage('1234A', 3, EntrySensorMessage.EventType.OPEN))
+        n = nibbles(frame)
+        self.assertEqual(Transceiver.decode(bits(n + 'F' + n[:3])), frame)
+
+    def test_unknown_plc(self):
+        frame = bytes((*self.FRAME[:2], 0x44, *self.FRAME[3:])) # Not in Message.PAYLOAD_LENGTHS, so the repeat is searched for
+        n = nibbles(frame)
+        self.assertEqual(Transceiver.decode(bits(n + 'F' + n)), frame)
+        self.assertEqual(Transceiver.decode(bits(n + 'F')), frame)
+
+    def test_capture_ends_at_frame(self):
+        n = nibbles(self.FRAME)
+        self.assertEqual(Transceiver.decode(bits(n + 'F')), self.FRAME) # Just the delimiter
+        with self.assertRaises(DecodeError):
+            Transceiver.decode(bits(n)) # No delimiter, so the last nibble is dropped
+
+
+if __name__ == '__main__':
+    unittest.main()